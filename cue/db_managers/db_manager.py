@@ -27,3 +27,8 @@ class AbstractDbManager(ABC):
     def detatch_delete_nodes_with_path(self, path: str) -> None:
         """Detach and delete nodes matching the given path."""
         raise NotImplementedError
+
+    def detatch_delete_nodes_with_paths(self, paths: List[str]) -> None:
+        """Detach and delete nodes matching any of the given paths."""
+        for path in paths:
+            self.detatch_delete_nodes_with_path(path)
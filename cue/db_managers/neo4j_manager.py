@@ -3,7 +3,7 @@ import time
 from typing import Any, List, Optional
 
 from dotenv import load_dotenv
-from neo4j import Driver, GraphDatabase, exceptions
+from neo4j import Driver, GraphDatabase, Session, exceptions
 import logging
 
 from .db_manager import AbstractDbManager
@@ -18,6 +18,9 @@ class Neo4jManager(AbstractDbManager):
     repo_id: str
     driver: Driver
 
+    # Rows committed per inner transaction by apoc.periodic.iterate
+    BATCH_SIZE = 5000
+
     def __init__(
         self,
         repo_id: Optional[str] = None,
@@ -44,26 +47,34 @@ class Neo4jManager(AbstractDbManager):
 
         self.repo_id = repo_id if repo_id is not None else "default_repo"
         self.entity_id = entity_id if entity_id is not None else "default_user"
+        self._session: Optional[Session] = None
 
     def close(self) -> None:
         # Close the connection to the database
+        if self._session is not None:
+            self._session.close()
+            self._session = None
         self.driver.close()
 
+    def _get_session(self) -> Session:
+        # Writes run one after another, so a single session is reused until close()
+        if self._session is None:
+            self._session = self.driver.session()
+        return self._session
+
     def save_graph(self, nodes: List[Any], edges: List[Any]) -> None:
         self.create_nodes(nodes)
         self.create_edges(edges)
 
     def create_nodes(self, nodeList: List[Any]) -> None:
         # Function to create nodes in the Neo4j database
-        with self.driver.session() as session:
-            session.execute_write(
-                self._create_nodes_txn, nodeList, 100, repoId=self.repo_id, entityId=self.entity_id
-            )
+        self._get_session().execute_write(
+            self._create_nodes_txn, nodeList, self.BATCH_SIZE, repoId=self.repo_id, entityId=self.entity_id
+        )
 
     def create_edges(self, edgesList: List[Any]) -> None:
         # Function to create edges between nodes in the Neo4j database
-        with self.driver.session() as session:
-            session.execute_write(self._create_edges_txn, edgesList, 100, entityId=self.entity_id)
+        self._get_session().execute_write(self._create_edges_txn, edgesList, self.BATCH_SIZE, entityId=self.entity_id)
 
     @staticmethod
     def _create_nodes_txn(tx: Any, nodeList: List[Any], batch_size: int, repoId: str, entityId: str) -> None:
@@ -120,11 +131,22 @@ class Neo4jManager(AbstractDbManager):
             logger.info(f"Created {record['total']} edges")
 
     def detatch_delete_nodes_with_path(self, path: str) -> None:
-        with self.driver.session() as session:
-            session.run(
-                """
-                MATCH (n {path: $path})
-                DETACH DELETE n
-                """,
-                path=path,
-            )
+        # Consume the auto-commit result so a failed delete raises here, not on the next query
+        self._get_session().run(
+            """
+            MATCH (n {path: $path})
+            DETACH DELETE n
+            """,
+            path=path,
+        ).consume()
+
+    def detatch_delete_nodes_with_paths(self, paths: List[str]) -> None:
+        # Delete every path in one round trip instead of one query per file
+        self._get_session().run(
+            """
+            UNWIND $paths AS path
+            MATCH (n {path: path})
+            DETACH DELETE n
+            """,
+            paths=paths,
+        ).consume()
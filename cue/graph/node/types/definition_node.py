@@ -9,6 +9,9 @@ if TYPE_CHECKING:
     from cue.graph.graph_environment import GraphEnvironment
     from cue.stats.complexity import NestingStats
 
+# Placeholder left by _get_text_for_skeleton() in place of a child's code
+_SKELETON_PLACEHOLDER_RE = re.compile(r"# Code replaced for brevity, see node: \w+\n")
+
 
 class DefinitionNode(Node):
     _defines: List[Any]  # Using Any to break circular imports
@@ -174,8 +177,8 @@ class DefinitionNode(Node):
 
     def is_code_text_equivalent(self, code_text: str) -> bool:
         # Removing _get_text_for_skeleton() from code_text with a regex
-        stripped_code_text = re.sub(r"# Code replaced for brevity, see node: \w+\n", "", self.code_text)
-        other_code_text = re.sub(r"# Code replaced for brevity, see node: \w+\n", "", code_text)
+        stripped_code_text = _SKELETON_PLACEHOLDER_RE.sub("", self.code_text)
+        other_code_text = _SKELETON_PLACEHOLDER_RE.sub("", code_text)
 
         return stripped_code_text == other_code_text
 
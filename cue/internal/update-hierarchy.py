@@ -72,8 +72,7 @@ def update(updated_files: List[UpdatedFile], root_uri: str, blarignore_path: Opt
 
 
 def delete_updated_files_from_neo4j(updated_files: List[UpdatedFile], db_manager: Neo4jManager):
-    for updated_file in updated_files:
-        db_manager.detatch_delete_nodes_with_path(updated_file.path)
+    db_manager.detatch_delete_nodes_with_paths([updated_file.path for updated_file in updated_files])
 
 
 if __name__ == "__main__":
@@ -15,6 +15,13 @@ from .llm_service import LLMService
 
 logger = logging.getLogger(__name__)
 
+# Function/class/method names in backticks or quotes
+_REFERENCE_PATTERNS = (
+    re.compile(r'`([a-zA-Z_][a-zA-Z0-9_]*)`'),  # Backticks
+    re.compile(r'"([a-zA-Z_][a-zA-Z0-9_]*)"'),  # Double quotes
+    re.compile(r"'([a-zA-Z_][a-zA-Z0-9_]*)'"),  # Single quotes
+)
+
 
 class DescriptionGenerator:
     """Generates LLM descriptions for code nodes and creates description nodes."""
@@ -275,16 +282,9 @@ Please provide a concise description (2-3 sentences) of what this module contain
         referenced_nodes: List["Node"] = []
         
         # Look for function/class/method names in backticks or quotes
-        patterns = [
-            r'`([a-zA-Z_][a-zA-Z0-9_]*)`',  # Backticks
-            r'"([a-zA-Z_][a-zA-Z0-9_]*)"',  # Double quotes
-            r"'([a-zA-Z_][a-zA-Z0-9_]*)'",  # Single quotes
-        ]
-        
         potential_references: Set[str] = set()
-        for pattern in patterns:
-            matches = re.findall(pattern, description)
-            potential_references.update(matches)
+        for pattern in _REFERENCE_PATTERNS:
+            potential_references.update(pattern.findall(description))
         
         # Try to find nodes with these names
         for ref_name in potential_references:
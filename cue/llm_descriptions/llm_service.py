@@ -1,6 +1,7 @@
 import os
 import logging
-from typing import List, Dict, Optional, Any, Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional, Any, Callable, Tuple
 from dotenv import load_dotenv
 from openai import AzureOpenAI
 import time
@@ -115,28 +116,29 @@ class LLMService:
             return {p["id"]: None for p in prompts}
         
         batch_size = batch_size or int(os.getenv("LLM_BATCH_SIZE", "10"))
+        max_workers = max(1, int(os.getenv("LLM_MAX_WORKERS", "4")))
         results: Dict[str, Optional[str]] = {}
         
-        for i in range(0, len(prompts), batch_size):
-            batch = prompts[i:i + batch_size]
-            logger.info(f"Processing batch {i//batch_size + 1}/{(len(prompts) + batch_size - 1)//batch_size}")
-            
-            for prompt_data in batch:
-                prompt_id = prompt_data["id"]
-                prompt_text = prompt_data["prompt"]
+        # Prompts in a batch are described concurrently; the worker cap is the rate limit
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for i in range(0, len(prompts), batch_size):
+                batch = prompts[i:i + batch_size]
+                logger.info(f"Processing batch {i//batch_size + 1}/{(len(prompts) + batch_size - 1)//batch_size}")
                 
-                try:
-                    description = self.generate_description(prompt_text)
+                for prompt_id, description in executor.map(self._describe_prompt, batch):
                     results[prompt_id] = description
-                except Exception as e:
-                    logger.error(f"Failed to generate description for {prompt_id}: {str(e)}")
-                    results[prompt_id] = None
-                
-                # Add a small delay between requests to avoid rate limiting
-                time.sleep(0.1)
         
         return results
     
+    def _describe_prompt(self, prompt_data: Dict[str, str]) -> Tuple[str, Optional[str]]:
+        """Generate the description for one batch entry, returning None on failure."""
+        prompt_id = prompt_data["id"]
+        try:
+            return prompt_id, self.generate_description(prompt_data["prompt"])
+        except Exception as e:
+            logger.error(f"Failed to generate description for {prompt_id}: {str(e)}")
+            return prompt_id, None
+    
     def is_enabled(self) -> bool:
         """Check if LLM descriptions are enabled."""
         return self.enabled
\ No newline at end of file
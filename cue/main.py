@@ -136,8 +136,7 @@ def main_update(updated_files: List[str], root_uri: Optional[str] = None, blarig
 
 
 def delete_updated_files_from_neo4j(updated_files: List[Any], db_manager: Neo4jManager) -> None:
-    for updated_file in updated_files:
-        db_manager.detatch_delete_nodes_with_path(updated_file.path)
+    db_manager.detatch_delete_nodes_with_paths([updated_file.path for updated_file in updated_files])
 
 
 def main_diff_with_previous(
@@ -26,7 +26,17 @@ class Config:
     AZURE_OPENAI_API_KEY: Optional[str] = os.getenv("AZURE_OPENAI_API_KEY")
     AZURE_OPENAI_ENDPOINT: Optional[str] = os.getenv("AZURE_OPENAI_ENDPOINT")
     AZURE_OPENAI_DEPLOYMENT_NAME: str = os.getenv("AZURE_OPENAI_DEPLOYMENT_NAME", "gpt-4")
+    # Smaller, faster deployment for entity extraction (falls back to the main deployment)
+    AZURE_OPENAI_DEPLOYMENT_NAME_SMALL: Optional[str] = os.getenv("AZURE_OPENAI_DEPLOYMENT_NAME_SMALL")
     AZURE_OPENAI_API_VERSION: str = os.getenv("AZURE_OPENAI_API_VERSION", "2024-02-15-preview")
+    # Embedding deployment for the semantic entity-extraction cache (disabled when unset)
+    AZURE_OPENAI_EMBEDDING_DEPLOYMENT: Optional[str] = os.getenv("AZURE_OPENAI_EMBEDDING_DEPLOYMENT")
+    SEMANTIC_CACHE_THRESHOLD: float = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.92"))
+    LLM_MAX_CONCURRENCY: int = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+    # Global-Batch deployment for offline bulk planning (disabled when unset)
+    AZURE_OPENAI_BATCH_DEPLOYMENT: Optional[str] = os.getenv("AZURE_OPENAI_BATCH_DEPLOYMENT")
+    LLM_BATCH_MIN_REQUESTS: int = int(os.getenv("LLM_BATCH_MIN_REQUESTS", "20"))
+    LLM_BATCH_POLL_SECONDS: float = float(os.getenv("LLM_BATCH_POLL_SECONDS", "30"))
     
     # Graph traversal settings
     MAX_TRAVERSAL_DEPTH: int = int(os.getenv("MAX_TRAVERSAL_DEPTH", "3"))
@@ -39,6 +49,14 @@ class Config:
     # Cache settings
     ENABLE_QUERY_CACHE: bool = os.getenv("ENABLE_QUERY_CACHE", "true").lower() == "true"
     CACHE_TTL_SECONDS: int = int(os.getenv("CACHE_TTL_SECONDS", "3600"))
+    # Low-temperature LLM replies are always cached; this caches every reply
+    ENABLE_LLM_CACHE: bool = os.getenv("ENABLE_LLM_CACHE", "false").lower() == "true"
+    # Persist LLM replies to this directory; unset keeps the cache in memory only
+    LLM_CACHE_DIR: Optional[str] = os.getenv("LLM_CACHE_DIR") or None
+    # Share cached LLM replies across processes through Redis instead of LLM_CACHE_DIR
+    LLM_CACHE_REDIS_URL: Optional[str] = os.getenv("LLM_CACHE_REDIS_URL")
+    # Render file context one cached section at a time so unchanged sections skip the LLM
+    LLM_SECTION_CACHE: bool = os.getenv("LLM_SECTION_CACHE", "false").lower() == "true"
     
     @classmethod
     def validate(cls) -> None:
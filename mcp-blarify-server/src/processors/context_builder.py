@@ -3,11 +3,18 @@
 import logging
 from typing import Dict, Any, List
 from collections import defaultdict
+from operator import itemgetter
 
 from ..config import Config
 
 logger = logging.getLogger(__name__)
 
+# Caps on how many entries of each list are rendered before "... and N more";
+# _SHORT_LIST_LIMIT covers the importer, subclass and caller lists
+_CONTENTS_LIMIT = 10
+_SHORT_LIST_LIMIT = 5
+_MORE_FMT = "... and {} more".format
+
 
 class ContextBuilder:
     """Builds structured context from graph traversal results."""
@@ -22,29 +29,33 @@ class ContextBuilder:
         if not file_contexts:
             return "# No Files Found\n\nNo files matching the specified paths were found in the graph."
         
+        max_context_length = self.max_context_length
         sections = []
+        sections_append = sections.append
+        build_section = self._build_single_file_section
         
-        # Group files by directory for better organization
-        files_by_dir = defaultdict(list)
+        # Key files by directory in one pass; the stable sort keeps input order within a directory
+        keyed = []
         for context in file_contexts:
             if file_info := context.get("file"):
                 path = file_info.get("path", "unknown")
-                dir_path = "/".join(path.split("/")[:-1]) or "/"
-                files_by_dir[dir_path].append(context)
+                idx = path.rfind("/")
+                keyed.append((path[:idx] if idx > 0 else "/", context))
+        keyed.sort(key=itemgetter(0))
         
         # Build context for each directory
-        for dir_path, contexts in sorted(files_by_dir.items()):
-            if dir_path != "/":
-                sections.append(f"## Directory: {dir_path}\n")
-            
-            for context in contexts:
-                file_section = self._build_single_file_section(context)
-                sections.append(file_section)
+        last_dir = None
+        for dir_path, context in keyed:
+            if dir_path != last_dir:
+                if dir_path != "/":
+                    sections_append(f"## Directory: {dir_path}\n")
+                last_dir = dir_path
+            sections_append(build_section(context))
         
         full_context = "\n".join(sections)
         
         # Truncate if too long
-        if len(full_context) > self.max_context_length:
+        if len(full_context) > max_context_length:
             full_context = self._truncate_context(full_context)
         
         return full_context
@@ -54,23 +65,30 @@ class ContextBuilder:
         if not symbol_context or not symbol_context.get("symbol"):
             return "# Symbol Not Found\n\nThe requested symbol could not be found in the graph."
         
-        sections = []
+        max_context_length = self.max_context_length
+        build_section = self._build_symbol_section
         
         # Main symbol context
-        main_section = self._build_symbol_section(symbol_context, is_main=True)
-        sections.append(main_section)
+        main_section = build_section(symbol_context, is_main=True)
+        
+        # Most lookups have no related symbols and fit within the limit
+        if not related_symbols and len(main_section) <= max_context_length:
+            return main_section
+        
+        sections = [main_section]
         
         # Related symbols
         if related_symbols:
             sections.append("\n## Related Symbols\n")
-            for related in related_symbols[:5]:  # Limit to 5 related symbols
-                related_section = self._build_symbol_section(related, is_main=False)
-                sections.append(related_section)
+            sections.extend(
+                build_section(related, is_main=False)
+                for related in related_symbols[:5]  # Limit to 5 related symbols
+            )
         
         full_context = "\n".join(sections)
         
         # Truncate if too long
-        if len(full_context) > self.max_context_length:
+        if len(full_context) > max_context_length:
             full_context = self._truncate_context(full_context)
         
         return full_context
@@ -108,26 +126,26 @@ class ContextBuilder:
             grouped = self._group_by_type(contents)
             for node_type, nodes in grouped.items():
                 if nodes:
-                    section += f"- {node_type}s: {', '.join(n.get('name', 'Unknown') for n in nodes[:10])}\n"
-                    if len(nodes) > 10:
-                        section += f"  - ... and {len(nodes) - 10} more\n"
+                    section += f"- {node_type}s: {', '.join(n.get('name', 'Unknown') for n in nodes[:_CONTENTS_LIMIT])}\n"
+                    if len(nodes) > _CONTENTS_LIMIT:
+                        section += f"  - {_MORE_FMT(len(nodes) - _CONTENTS_LIMIT)}\n"
         
         # Add dependencies
         if imports := context.get("imports"):
             section += "\n**Imports**:\n"
-            for imp in imports[:10]:
+            for imp in imports[:_CONTENTS_LIMIT]:
                 imp_name = imp.get("name", imp.get("path", "Unknown"))
                 section += f"- {imp_name}\n"
-            if len(imports) > 10:
-                section += f"- ... and {len(imports) - 10} more\n"
+            if len(imports) > _CONTENTS_LIMIT:
+                section += f"- {_MORE_FMT(len(imports) - _CONTENTS_LIMIT)}\n"
         
         # Add usage
         if importers := context.get("importers"):
             section += "\n**Imported by**:\n"
-            for imp in importers[:5]:
+            for imp in importers[:_SHORT_LIST_LIMIT]:
                 section += f"- {imp.get('path', 'Unknown')}\n"
-            if len(importers) > 5:
-                section += f"- ... and {len(importers) - 5} more\n"
+            if len(importers) > _SHORT_LIST_LIMIT:
+                section += f"- {_MORE_FMT(len(importers) - _SHORT_LIST_LIMIT)}\n"
         
         section += "\n"
         return section
@@ -158,23 +176,23 @@ class ContextBuilder:
             section += f"\n**Inherits from**: {', '.join(p.get('name', 'Unknown') for p in parents)}\n"
         
         if children := context.get("children"):
-            section += f"**Inherited by**: {', '.join(c.get('name', 'Unknown') for c in children[:5])}"
-            if len(children) > 5:
-                section += f" ... and {len(children) - 5} more"
+            section += f"**Inherited by**: {', '.join(c.get('name', 'Unknown') for c in children[:_SHORT_LIST_LIMIT])}"
+            if len(children) > _SHORT_LIST_LIMIT:
+                section += " " + _MORE_FMT(len(children) - _SHORT_LIST_LIMIT)
             section += "\n"
         
         # Add methods for classes
         if methods := context.get("methods"):
             section += "\n**Methods**:\n"
-            for method in methods[:10]:
+            for method in methods[:_CONTENTS_LIMIT]:
                 section += f"- {method.get('name', 'Unknown')}\n"
-            if len(methods) > 10:
-                section += f"- ... and {len(methods) - 10} more\n"
+            if len(methods) > _CONTENTS_LIMIT:
+                section += f"- {_MORE_FMT(len(methods) - _CONTENTS_LIMIT)}\n"
         
         # Add usage
         if callers := context.get("callers"):
             section += f"\n**Called by**: {len(callers)} locations\n"
-            for caller in callers[:5]:
+            for caller in callers[:_SHORT_LIST_LIMIT]:
                 caller_name = caller.get("name", "Unknown")
                 if caller_file := caller.get("path"):
                     section += f"- {caller_name} in `{caller_file}`\n"
@@ -219,7 +237,7 @@ class ContextBuilder:
         for entity, impact in impact_analysis.items():
             for f in impact.get("containing_files", []):
                 files.add(f.get("path", ""))
-        return sorted(list(files))
+        return sorted(files)
     
     def _extract_test_files(self, impact_analysis: Dict[str, Any]) -> List[str]:
         """Extract all test files from impact analysis."""
@@ -227,7 +245,7 @@ class ContextBuilder:
         for entity, impact in impact_analysis.items():
             for f in impact.get("test_files", []):
                 files.add(f.get("path", ""))
-        return sorted(list(files))
+        return sorted(files)
     
     def _extract_documentation_files(self, impact_analysis: Dict[str, Any]) -> List[str]:
         """Extract all documentation files from impact analysis."""
@@ -235,7 +253,7 @@ class ContextBuilder:
         for entity, impact in impact_analysis.items():
             for d in impact.get("documentation", []):
                 files.add(d.get("path", ""))
-        return sorted(list(files))
+        return sorted(files)
     
     def _truncate_context(self, context: str) -> str:
         """Truncate context to maximum length."""
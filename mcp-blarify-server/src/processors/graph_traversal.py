@@ -1,6 +1,6 @@
 """Graph traversal logic for extracting context from Neo4j."""
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 from neo4j import Driver
 import logging
 
@@ -9,26 +9,54 @@ from ..tools.query_builder import QueryBuilder
 
 logger = logging.getLogger(__name__)
 
+# Record fields returned by get_symbol_context_query
+_SYMBOL_LIST_KEYS = (
+    "parents", "interfaces", "children", "methods", "attributes",
+    "callers", "callees", "referencers", "documentation", "concepts"
+)
+_SYMBOL_SCALAR_KEYS = ("file", "description")
+
+# Properties kept for code nodes; everything else (notably the full source
+# "text" Blarify stores on FILE/CLASS/FUNCTION nodes) is never read downstream
+_FILE_PROPERTIES = ("path", "name", "extension", "level", "node_id")
+_CODE_PROPERTIES = ("name", "path", "level", "node_id", "line", "start_line", "end_line")
+
 
 class GraphTraversal:
     """Handles graph traversal operations."""
     
+    # Property projections per label set; unlisted label sets keep every property
+    _PROJECTIONS: Dict[frozenset, Tuple[str, ...]] = {
+        frozenset(labels): properties
+        for base_labels, properties in (
+            (("FILE",), _FILE_PROPERTIES),
+            (("FOLDER",), _FILE_PROPERTIES),
+            (("CLASS",), _CODE_PROPERTIES),
+            (("FUNCTION",), _CODE_PROPERTIES),
+            (("METHOD", "FUNCTION"), _CODE_PROPERTIES),
+        )
+        # Nodes written by Blarify also carry the generic NODE label
+        for labels in (base_labels, base_labels + ("NODE",))
+    }
+    
     def __init__(self, driver: Driver):
         """Initialize with Neo4j driver."""
         self.driver = driver
         self.query_builder = QueryBuilder()
+        # Label tuples keyed by label set; each result gets its own list copy
+        self._labels_cache: Dict[frozenset, Tuple[str, ...]] = {}
     
     def find_files(self, file_paths: List[str]) -> List[Dict[str, Any]]:
         """Find FILE nodes matching the given paths."""
+        return list(self.iter_files(file_paths))
+    
+    def iter_files(self, file_paths: List[str]) -> Iterator[Dict[str, Any]]:
+        """Yield FILE nodes matching the given paths as they are streamed from Neo4j."""
         query = self.query_builder.find_files_query(file_paths)
         
         with self.driver.session(database=Config.NEO4J_DATABASE) as session:
-            result = session.run(query)
-            files = []
-            for record in result:
-                node = record["n"]
-                files.append(self._node_to_dict(node))
-            return files
+            for record in session.run(query):
+                yield self._node_to_dict(record["n"])
     
     def get_file_context(self, file_path: str) -> Dict[str, Any]:
         """Get comprehensive context for a file."""
@@ -83,21 +111,13 @@ class GraphTraversal:
             if not record:
                 return {}
             
-            context = {
-                "symbol": self._node_to_dict(record["symbol"]),
-                "file": self._node_to_dict(record["file"]) if record["file"] else None,
-                "parents": [self._node_to_dict(n) for n in record["parents"] if n],
-                "interfaces": [self._node_to_dict(n) for n in record["interfaces"] if n],
-                "children": [self._node_to_dict(n) for n in record["children"] if n],
-                "methods": [self._node_to_dict(n) for n in record["methods"] if n],
-                "attributes": [self._node_to_dict(n) for n in record["attributes"] if n],
-                "callers": [self._node_to_dict(n) for n in record["callers"] if n],
-                "callees": [self._node_to_dict(n) for n in record["callees"] if n],
-                "referencers": [self._node_to_dict(n) for n in record["referencers"] if n],
-                "documentation": [self._node_to_dict(n) for n in record["documentation"] if n],
-                "description": self._node_to_dict(record["description"]) if record["description"] else None,
-                "concepts": [self._node_to_dict(n) for n in record["concepts"] if n]
-            }
+            n2d = self._node_to_dict
+            context = {"symbol": n2d(record["symbol"])}
+            for key in _SYMBOL_LIST_KEYS:
+                context[key] = list(map(n2d, filter(None, record[key])))
+            for key in _SYMBOL_SCALAR_KEYS:
+                value = record[key]
+                context[key] = n2d(value) if value else None
             
             return context
     
@@ -106,22 +126,20 @@ class GraphTraversal:
         query = self.query_builder.analyze_change_impact_query(entity_names)
         
         with self.driver.session(database=Config.NEO4J_DATABASE) as session:
-            result = session.run(query)
+            n2d = self._node_to_dict
             
-            impacts = {}
-            for record in result:
-                target = self._node_to_dict(record["target"])
+            def convert(record) -> Tuple[str, Dict[str, Any]]:
+                target = n2d(record["target"])
                 target_name = target.get("name", target.get("path", "unknown"))
-                
-                impacts[target_name] = {
+                return target_name, {
                     "target": target,
-                    "dependents": [self._node_to_dict(n) for n in record["dependents"] if n],
-                    "containing_files": [self._node_to_dict(n) for n in record["containing_files"] if n],
-                    "test_files": [self._node_to_dict(n) for n in record["test_files"] if n],
-                    "documentation": [self._node_to_dict(n) for n in record["documentation"] if n]
+                    "dependents": list(map(n2d, filter(None, record["dependents"]))),
+                    "containing_files": list(map(n2d, filter(None, record["containing_files"]))),
+                    "test_files": list(map(n2d, filter(None, record["test_files"]))),
+                    "documentation": list(map(n2d, filter(None, record["documentation"])))
                 }
             
-            return impacts
+            return dict(map(convert, session.run(query)))
     
     def find_patterns(self, concept_name: str) -> Dict[str, Any]:
         """Find code implementing specific patterns or concepts."""
@@ -146,12 +164,28 @@ class GraphTraversal:
         if not node:
             return None
         
-        # Get all properties
-        props = dict(node)
+        labels = node.labels
+        key = frozenset(labels)
+        
+        # Copy only the properties consumers read for known node types
+        projection = self._PROJECTIONS.get(key)
+        if projection is None:
+            props = dict(node)
+        else:
+            get = node.get
+            props = {}
+            for prop in projection:
+                value = get(prop)
+                if value is not None:
+                    props[prop] = value
         
         # Add node metadata
         props["_id"] = node.id
-        props["_labels"] = list(node.labels)
+        cached_labels = self._labels_cache.get(key)
+        if cached_labels is None:
+            cached_labels = tuple(labels)
+            self._labels_cache[key] = cached_labels
+        props["_labels"] = list(cached_labels)
         
         return props
     
@@ -1,117 +1,473 @@
 """LLM processor for organizing and structuring graph data."""
 
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
 import json
 import logging
-from typing import Dict, Any, List
-from openai import AzureOpenAI
+import math
+import os
+import random
+import re
+import time
+import weakref
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterator, List, Optional, Tuple
+import httpx
+from openai import (
+    APIConnectionError, AsyncAzureOpenAI, AzureOpenAI, InternalServerError, RateLimitError
+)
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import re2
+except ImportError:
+    re2 = None
 
 from ..config import Config
+from .response_cache import ResponseCache, SemanticCache
 
 logger = logging.getLogger(__name__)
 
 
+# System prompts sent with every request of the matching kind
+_SYS_FILE_CONTEXT = "You are a code analysis assistant. Organize the provided graph data into clear, structured Markdown that helps developers understand the code context."
+_SYS_SYMBOL_CONTEXT = "You are a code analysis assistant. Organize the provided symbol information into clear, structured Markdown that helps developers understand how the symbol is used."
+_SYS_PLAN = "You are a software architect. Create detailed implementation plans that consider dependencies, testing, and documentation."
+_SYS_ENTITY = "You are a code parser. Extract entity names from text."
+
+# Fixed user-prompt instructions; they lead each prompt so every request of a
+# kind shares the longest possible prefix, with the variable context last
+_FILE_CONTEXT_INSTRUCTIONS = """Organize the file context below into a well-structured Markdown document with:
+1. File overview
+2. What it contains (classes, functions)
+3. Dependencies (what it imports)
+4. Usage (what imports it)
+5. Related documentation
+6. Any available descriptions
+
+Use clear headers and formatting."""
+_SYMBOL_CONTEXT_INSTRUCTIONS = """Organize the symbol context below into a well-structured Markdown document that explains:
+1. What the symbol is and where it's defined
+2. Its inheritance/implementation hierarchy
+3. Its members (for classes)
+4. How it's used in the codebase
+5. Related documentation"""
+_PLAN_INSTRUCTIONS = """Create a detailed implementation plan for the change request below that includes:
+1. Summary of the change
+2. Impact analysis (affected components)
+3. Step-by-step implementation plan
+4. Files to create/modify/delete
+5. Required tests
+6. Documentation updates
+7. Dependencies to consider
+
+Format as clear Markdown with numbered steps and specific file paths."""
+_FILE_SECTION_INSTRUCTIONS = """Render the graph data below as a single Markdown section of a file context document.
+Start with a "## " header named after the section and output only that section."""
+_ENTITY_INSTRUCTIONS = """Extract all code entities (classes, functions, modules, files) mentioned in the change request below.
+Return them as a JSON object of the form {"entities": ["name", ...]}."""
+_BATCH_ENTITY_INSTRUCTIONS = """Extract all code entities (classes, functions, modules, files) mentioned in each of the following change requests.
+Return a JSON object whose keys are the request index as a string and whose values are JSON arrays of entity names."""
+
+# File context sections rendered independently when LLM_SECTION_CACHE is set:
+# (section title, context key holding its graph data)
+_FILE_SECTIONS = [
+    ("Overview", "file"),
+    ("Contains", "contents"),
+    ("Dependencies", "imports"),
+    ("Used By", "importers"),
+    ("Documentation", "documentation"),
+    ("Description", "description"),
+]
+
+# Change requests packed into one batched entity-extraction call
+_ENTITY_BATCH_SIZE = 20
+# A single request's entity list is a short JSON object of ~20 identifiers
+_ENTITY_MAX_TOKENS = 150
+_ENTITY_BATCH_TOKENS_PER_REQUEST = 200
+
+# Rule-based entity extraction: quoted strings, backtick strings, CamelCase, snake_case
+_ENTITY_PATTERN = (
+    r'"(?P<quoted>[^"]+)"'
+    r'|`(?P<backtick>[^`]+)`'
+    r'|\b(?P<camel>[A-Z][a-zA-Z0-9]+)\b'
+    r'|\b(?P<snake>[a-z_][a-z0-9_]+)\b'
+)
+_ENTITY_RE = re.compile(_ENTITY_PATTERN)
+# Long requests use re2's linear-time matcher when installed; short ones stay on re
+_ENTITY_RE2 = re2.compile(_ENTITY_PATTERN) if re2 is not None else None
+_RE2_MIN_LENGTH = 2048
+_COMMON_WORDS = frozenset({'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for'})
+_MAX_BASIC_ENTITIES = 20
+
+# Replies at or below this temperature are cached even without ENABLE_LLM_CACHE
+_CACHEABLE_MAX_TEMPERATURE = 0.2
+
+# Connection pool shared by every LLMProcessor talking to the same deployment
+_HTTP_LIMITS = httpx.Limits(max_connections=32, max_keepalive_connections=16)
+_HTTP_TIMEOUT = 60.0
+
+
+class _NoRunningLoop:
+    """Key for async clients requested outside an event loop."""
+
+
+# httpx.AsyncClient pools connections on the loop that opened them, so async clients
+# are kept per event loop (then per credentials) and dropped when their loop is collected
+_async_clients: "weakref.WeakKeyDictionary[Any, Dict[Tuple[str, str, str], AsyncAzureOpenAI]]" = (
+    weakref.WeakKeyDictionary()
+)
+_NO_RUNNING_LOOP = _NoRunningLoop()
+
+# Transient failures retried with exponential backoff and jitter before falling back
+# to the rule-based builders (APITimeoutError is an APIConnectionError)
+_RETRYABLE_ERRORS = (APIConnectionError, RateLimitError, InternalServerError)
+_RETRY_ATTEMPTS = 3
+_RETRY_BASE_DELAY = 0.5
+# Upper bound on any single wait, so a hostile or garbled Retry-After cannot stall a request
+_RETRY_MAX_DELAY = 30.0
+
+# Appended to an unbuffered stream that fails after output has been sent, so the
+# partial reply is not mistaken for a complete one
+_TRUNCATED_MARKER = "\n\n_[Response truncated: the LLM stream failed]_\n"
+
+# Batch API jobs for offline planning; a job stops changing once it reaches one of these
+_BATCH_ENDPOINT = "/chat/completions"
+_BATCH_TERMINAL_STATUSES = frozenset({"completed", "failed", "expired", "cancelled"})
+
+# Longest list embedded in a prompt before the tail is summarized
+_PROMPT_LIST_LIMIT = 50
+_COMPACT_SEPARATORS = (",", ":")
+
+_llm_processor: Optional["LLMProcessor"] = None
+
+
+def _dumps(value: Any) -> str:
+    """Serialize to compact JSON, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(value).decode("utf-8")
+    return json.dumps(value, separators=_COMPACT_SEPARATORS, ensure_ascii=False)
+
+
+def _loads(content: str) -> Any:
+    """Parse JSON, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+def _prompt_json(value: Any) -> str:
+    """Serialize graph data compactly for a prompt, capping long lists."""
+    if isinstance(value, list) and len(value) > _PROMPT_LIST_LIMIT:
+        shown = _dumps(value[:_PROMPT_LIST_LIMIT])
+        return f"{shown} ... ({len(value) - _PROMPT_LIST_LIMIT} more omitted)"
+    return _dumps(value)
+
+
+@functools.lru_cache(maxsize=8)
+def _get_azure_client(endpoint: str, api_version: str, api_key: str) -> AzureOpenAI:
+    """Return the shared sync Azure OpenAI client for these credentials."""
+    return AzureOpenAI(
+        api_key=api_key,
+        api_version=api_version,
+        azure_endpoint=endpoint,
+        max_retries=0,
+        http_client=httpx.Client(limits=_HTTP_LIMITS, timeout=_HTTP_TIMEOUT)
+    )
+
+
+def _get_async_azure_client(endpoint: str, api_version: str, api_key: str) -> AsyncAzureOpenAI:
+    """Return the shared async Azure OpenAI client for these credentials on the running event loop."""
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = _NO_RUNNING_LOOP
+    clients = _async_clients.setdefault(loop, {})
+    key = (endpoint, api_version, api_key)
+    if key not in clients:
+        clients[key] = AsyncAzureOpenAI(
+            api_key=api_key,
+            api_version=api_version,
+            azure_endpoint=endpoint,
+            max_retries=0,
+            http_client=httpx.AsyncClient(limits=_HTTP_LIMITS, timeout=_HTTP_TIMEOUT)
+        )
+    return clients[key]
+
+
+def _retry_delay(error: Exception, attempt: int) -> float:
+    """Return the backoff before the next attempt, honoring a rate limit's Retry-After."""
+    if isinstance(error, RateLimitError):
+        retry_after = error.response.headers.get("retry-after")
+        try:
+            delay = float(retry_after)
+        except (TypeError, ValueError):
+            delay = math.nan
+        if not math.isnan(delay):
+            return min(max(delay, 0.0), _RETRY_MAX_DELAY)
+    return _RETRY_BASE_DELAY * (2 ** attempt) + random.uniform(0, _RETRY_BASE_DELAY)
+
+
+def get_llm_processor() -> "LLMProcessor":
+    """Return the process-wide LLMProcessor, creating it on first use."""
+    global _llm_processor
+    if _llm_processor is None:
+        _llm_processor = LLMProcessor()
+    return _llm_processor
+
+
 class LLMProcessor:
     """Processes graph data using LLM to create structured output."""
     
     def __init__(self):
         """Initialize the LLM processor."""
         self.enabled = Config.AZURE_OPENAI_API_KEY is not None
+        self.max_concurrency = Config.LLM_MAX_CONCURRENCY
+        self._semaphore = None
+        self._semaphore_loop = None
+        self.response_cache = ResponseCache(
+            Config.LLM_CACHE_DIR, Config.CACHE_TTL_SECONDS, redis_url=Config.LLM_CACHE_REDIS_URL
+        )
+        self.section_cache = ResponseCache(
+            os.path.join(Config.LLM_CACHE_DIR, "sections") if Config.LLM_CACHE_DIR else None,
+            Config.CACHE_TTL_SECONDS,
+            redis_url=Config.LLM_CACHE_REDIS_URL,
+            namespace="sections"
+        )
+        self.stats = {"cache_hits": 0, "cache_misses": 0, "semantic_hits": 0, "section_hits": 0}
+        self.embedding_deployment = Config.AZURE_OPENAI_EMBEDDING_DEPLOYMENT
+        self.batch_deployment_name = Config.AZURE_OPENAI_BATCH_DEPLOYMENT
+        self.semantic_cache = SemanticCache(
+            os.path.join(Config.LLM_CACHE_DIR, "semantic_cache.json") if Config.LLM_CACHE_DIR else None,
+            Config.SEMANTIC_CACHE_THRESHOLD
+        )
         
         if self.enabled:
-            self.client = AzureOpenAI(
-                api_key=Config.AZURE_OPENAI_API_KEY,
-                api_version=Config.AZURE_OPENAI_API_VERSION,
-                azure_endpoint=Config.AZURE_OPENAI_ENDPOINT
+            self._credentials = (
+                Config.AZURE_OPENAI_ENDPOINT,
+                Config.AZURE_OPENAI_API_VERSION,
+                Config.AZURE_OPENAI_API_KEY
             )
+            self.client = _get_azure_client(*self._credentials)
             self.deployment_name = Config.AZURE_OPENAI_DEPLOYMENT_NAME
+            self.small_deployment_name = Config.AZURE_OPENAI_DEPLOYMENT_NAME_SMALL or self.deployment_name
         else:
             logger.warning("LLM processing disabled - no Azure OpenAI API key provided")
             self.client = None
     
-    def organize_file_context(self, context: Dict[str, Any]) -> str:
-        """Organize file context into structured Markdown."""
+    @property
+    def aclient(self) -> Optional[AsyncAzureOpenAI]:
+        """Return the async Azure OpenAI client for the running event loop, or None if disabled."""
+        if not self.enabled:
+            return None
+        return _get_async_azure_client(*self._credentials)
+    
+    def organize_file_context(self, context: Dict[str, Any], deployment: Optional[str] = None) -> str:
+        """Organize file context into structured Markdown, optionally on another deployment."""
+        return "".join(self.organize_file_context_stream(context, deployment, buffered=True))
+    
+    def organize_file_context_stream(self, context: Dict[str, Any], deployment: Optional[str] = None,
+                                     buffered: bool = False) -> Iterator[str]:
+        """Organize file context into Markdown, yielding chunks as produced (all at once if buffered)."""
         if not context or not context.get("file"):
-            return "# File Not Found\n\nThe requested file could not be found in the graph."
-        
-        file_info = context["file"]
-        file_path = file_info.get("path", "Unknown")
+            yield "# File Not Found\n\nThe requested file could not be found in the graph."
+            return
         
         # Build markdown without LLM if disabled
         if not self.enabled:
-            return self._build_file_context_markdown(context)
+            yield self._build_file_context_markdown(context)
+            return
+        
+        if Config.LLM_SECTION_CACHE:
+            yield from self._stream_with_fallback(
+                self._render_file_sections(context, deployment),
+                lambda: self._build_file_context_markdown(context),
+                buffered
+            )
+            return
         
         # Use LLM to organize the context
         prompt = self._create_file_context_prompt(context)
+        yield from self._stream_with_fallback(
+            self._chat_stream(_SYS_FILE_CONTEXT, prompt, temperature=0.3, max_tokens=2000, model=deployment),
+            lambda: self._build_file_context_markdown(context),
+            buffered
+        )
+    
+    async def aorganize_file_context(self, context: Dict[str, Any], deployment: Optional[str] = None) -> str:
+        """Async variant of organize_file_context for concurrent dispatch."""
+        return "".join([part async for part in self.aorganize_file_context_stream(context, deployment, buffered=True)])
+    
+    async def aorganize_file_context_stream(self, context: Dict[str, Any], deployment: Optional[str] = None,
+                                            buffered: bool = False) -> AsyncIterator[str]:
+        """Async variant of organize_file_context_stream."""
+        if not context or not context.get("file"):
+            yield "# File Not Found\n\nThe requested file could not be found in the graph."
+            return
         
-        try:
-            response = self.client.chat.completions.create(
-                model=self.deployment_name,
-                messages=[
-                    {"role": "system", "content": "You are a code analysis assistant. Organize the provided graph data into clear, structured Markdown that helps developers understand the code context."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.3,
-                max_tokens=2000
-            )
-            
-            return response.choices[0].message.content.strip()
-            
-        except Exception as e:
-            logger.error(f"LLM processing failed: {e}")
-            return self._build_file_context_markdown(context)
+        if not self.enabled:
+            yield self._build_file_context_markdown(context)
+            return
+        
+        if Config.LLM_SECTION_CACHE:
+            try:
+                sections = await asyncio.gather(*(
+                    self._arender_file_section(title, data, deployment) for title, data in self._file_sections(context)
+                ))
+            except Exception as e:
+                logger.error(f"LLM processing failed: {e}")
+                yield self._build_file_context_markdown(context)
+                return
+            yield f"# Context for File: {context['file'].get('path', 'Unknown')}\n\n"
+            for section in sections:
+                yield section
+            return
+        
+        prompt = self._create_file_context_prompt(context)
+        async for part in self._astream_with_fallback(
+            self._achat_stream(_SYS_FILE_CONTEXT, prompt, temperature=0.3, max_tokens=2000, model=deployment),
+            lambda: self._build_file_context_markdown(context),
+            buffered
+        ):
+            yield part
+    
+    def organize_symbol_context(self, context: Dict[str, Any], deployment: Optional[str] = None) -> str:
+        """Organize symbol context into structured Markdown, optionally on another deployment."""
+        return "".join(self.organize_symbol_context_stream(context, deployment, buffered=True))
     
-    def organize_symbol_context(self, context: Dict[str, Any]) -> str:
-        """Organize symbol context into structured Markdown."""
+    def organize_symbol_context_stream(self, context: Dict[str, Any], deployment: Optional[str] = None,
+                                       buffered: bool = False) -> Iterator[str]:
+        """Organize symbol context into Markdown, yielding chunks as produced (all at once if buffered)."""
         if not context or not context.get("symbol"):
-            return "# Symbol Not Found\n\nThe requested symbol could not be found in the graph."
+            yield "# Symbol Not Found\n\nThe requested symbol could not be found in the graph."
+            return
         
         # Build markdown without LLM if disabled
         if not self.enabled:
-            return self._build_symbol_context_markdown(context)
+            yield self._build_symbol_context_markdown(context)
+            return
         
         # Use LLM to organize the context
         prompt = self._create_symbol_context_prompt(context)
+        yield from self._stream_with_fallback(
+            self._chat_stream(_SYS_SYMBOL_CONTEXT, prompt, temperature=0.3, max_tokens=2000, model=deployment),
+            lambda: self._build_symbol_context_markdown(context),
+            buffered
+        )
+    
+    async def aorganize_symbol_context(self, context: Dict[str, Any], deployment: Optional[str] = None) -> str:
+        """Async variant of organize_symbol_context for concurrent dispatch."""
+        return "".join([part async for part in self.aorganize_symbol_context_stream(context, deployment, buffered=True)])
+    
+    async def aorganize_symbol_context_stream(self, context: Dict[str, Any], deployment: Optional[str] = None,
+                                              buffered: bool = False) -> AsyncIterator[str]:
+        """Async variant of organize_symbol_context_stream."""
+        if not context or not context.get("symbol"):
+            yield "# Symbol Not Found\n\nThe requested symbol could not be found in the graph."
+            return
         
-        try:
-            response = self.client.chat.completions.create(
-                model=self.deployment_name,
-                messages=[
-                    {"role": "system", "content": "You are a code analysis assistant. Organize the provided symbol information into clear, structured Markdown that helps developers understand how the symbol is used."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.3,
-                max_tokens=2000
-            )
-            
-            return response.choices[0].message.content.strip()
-            
-        except Exception as e:
-            logger.error(f"LLM processing failed: {e}")
-            return self._build_symbol_context_markdown(context)
+        if not self.enabled:
+            yield self._build_symbol_context_markdown(context)
+            return
+        
+        prompt = self._create_symbol_context_prompt(context)
+        async for part in self._astream_with_fallback(
+            self._achat_stream(_SYS_SYMBOL_CONTEXT, prompt, temperature=0.3, max_tokens=2000, model=deployment),
+            lambda: self._build_symbol_context_markdown(context),
+            buffered
+        ):
+            yield part
+    
+    def organize_files(self, contexts: List[Dict[str, Any]]) -> List[str]:
+        """Organize many file contexts in parallel, returning results in input order."""
+        return self._organize_many(self.organize_file_context, contexts)
+    
+    def organize_symbols(self, contexts: List[Dict[str, Any]]) -> List[str]:
+        """Organize many symbol contexts in parallel, returning results in input order."""
+        return self._organize_many(self.organize_symbol_context, contexts)
+    
+    async def aorganize_files(self, contexts: List[Dict[str, Any]]) -> List[str]:
+        """Organize many file contexts concurrently, capped at max_concurrency requests in flight."""
+        return list(await asyncio.gather(*(self.aorganize_file_context(context) for context in contexts)))
+    
+    async def aorganize_symbols(self, contexts: List[Dict[str, Any]]) -> List[str]:
+        """Organize many symbol contexts concurrently, capped at max_concurrency requests in flight."""
+        return list(await asyncio.gather(*(self.aorganize_symbol_context(context) for context in contexts)))
     
     def create_implementation_plan(self, change_request: str, impact_analysis: Dict[str, Any]) -> str:
         """Create an implementation plan based on change request and impact analysis."""
+        return "".join(self.create_implementation_plan_stream(change_request, impact_analysis, buffered=True))
+    
+    def create_implementation_plan_stream(self, change_request: str, impact_analysis: Dict[str, Any],
+                                         buffered: bool = False) -> Iterator[str]:
+        """Create an implementation plan, yielding chunks as produced (all at once if buffered)."""
         if not self.enabled:
-            return self._build_basic_implementation_plan(change_request, impact_analysis)
+            yield self._build_basic_implementation_plan(change_request, impact_analysis)
+            return
         
         prompt = self._create_implementation_plan_prompt(change_request, impact_analysis)
+        yield from self._stream_with_fallback(
+            self._chat_stream(_SYS_PLAN, prompt, temperature=0.4, max_tokens=3000),
+            lambda: self._build_basic_implementation_plan(change_request, impact_analysis),
+            buffered
+        )
+    
+    async def acreate_implementation_plan(self, change_request: str, impact_analysis: Dict[str, Any]) -> str:
+        """Async variant of create_implementation_plan."""
+        return "".join([
+            part async for part in self.acreate_implementation_plan_stream(change_request, impact_analysis, buffered=True)
+        ])
+    
+    async def acreate_implementation_plan_stream(self, change_request: str, impact_analysis: Dict[str, Any],
+                                                buffered: bool = False) -> AsyncIterator[str]:
+        """Async variant of create_implementation_plan_stream."""
+        if not self.enabled:
+            yield self._build_basic_implementation_plan(change_request, impact_analysis)
+            return
         
-        try:
-            response = self.client.chat.completions.create(
-                model=self.deployment_name,
-                messages=[
-                    {"role": "system", "content": "You are a software architect. Create detailed implementation plans that consider dependencies, testing, and documentation."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.4,
-                max_tokens=3000
-            )
-            
-            return response.choices[0].message.content.strip()
-            
-        except Exception as e:
-            logger.error(f"LLM processing failed: {e}")
-            return self._build_basic_implementation_plan(change_request, impact_analysis)
+        prompt = self._create_implementation_plan_prompt(change_request, impact_analysis)
+        async for part in self._astream_with_fallback(
+            self._achat_stream(_SYS_PLAN, prompt, temperature=0.4, max_tokens=3000),
+            lambda: self._build_basic_implementation_plan(change_request, impact_analysis),
+            buffered
+        ):
+            yield part
+    
+    async def abatch_implementation_plans(self, requests: List[Tuple[str, Dict[str, Any]]]) -> List[str]:
+        """Create plans for many (change request, impact analysis) pairs, via the Batch API for large runs."""
+        if not self.enabled or not self.batch_deployment_name or len(requests) < Config.LLM_BATCH_MIN_REQUESTS:
+            return list(await asyncio.gather(*(
+                self.acreate_implementation_plan(change_request, impact_analysis)
+                for change_request, impact_analysis in requests
+            )))
+        
+        keys = []
+        pending = {}
+        for change_request, impact_analysis in requests:
+            prompt = self._create_implementation_plan_prompt(change_request, impact_analysis)
+            request = self._build_request(_SYS_PLAN, prompt, 0.4, 3000, None, self.batch_deployment_name)
+            key = ResponseCache.make_key(request)
+            keys.append(key)
+            # Finished plans are cached by request hash, so a rerun only submits the rest
+            if self.response_cache.get(key) is None:
+                pending[key] = request
+        
+        plans = {}
+        if pending:
+            try:
+                plans = await self._run_batch(pending)
+            except Exception as e:
+                logger.error(f"Batch planning failed: {e}")
+        
+        # Plans the batch did not return are created interactively instead
+        return list(await asyncio.gather(*(
+            self._batched_plan(key, plans, change_request, impact_analysis)
+            for key, (change_request, impact_analysis) in zip(keys, requests)
+        )))
     
     def extract_entities_from_request(self, change_request: str) -> List[str]:
         """Extract entity names from a change request."""
@@ -119,199 +475,560 @@ class LLMProcessor:
             # Basic extraction without LLM
             return self._extract_entities_basic(change_request)
         
-        prompt = f"""Extract all code entities (classes, functions, modules, files) mentioned in this change request.
-Return them as a JSON array of strings.
-
-Change request: {change_request}
-
-Return only the JSON array, no other text."""
+        prompt = self._create_entity_extraction_prompt(change_request)
         
         try:
-            response = self.client.chat.completions.create(
-                model=self.deployment_name,
-                messages=[
-                    {"role": "system", "content": "You are a code parser. Extract entity names from text."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.1,
-                max_tokens=500
+            # Paraphrased requests can reuse an earlier extraction
+            embedding = self._embed(change_request)
+            if embedding is not None and (cached := self._semantic_lookup(change_request, embedding)) is not None:
+                return cached
+            
+            content = self._chat(
+                _SYS_ENTITY, prompt, temperature=0.1, max_tokens=_ENTITY_MAX_TOKENS,
+                response_format={"type": "json_object"}, model=self.small_deployment_name
             )
+            entities = self._parse_entities(content)
+            if embedding is not None:
+                self.semantic_cache.add(change_request, embedding, entities)
+            return entities
             
-            content = response.choices[0].message.content.strip()
-            # Try to parse JSON
-            if content.startswith("```json"):
-                content = content[7:]
-            if content.endswith("```"):
-                content = content[:-3]
+        except Exception as e:
+            logger.error(f"Entity extraction failed: {e}")
+            return self._extract_entities_basic(change_request)
+    
+    async def aextract_entities_from_request(self, change_request: str) -> List[str]:
+        """Async variant of extract_entities_from_request."""
+        if not self.enabled:
+            return self._extract_entities_basic(change_request)
+        
+        prompt = self._create_entity_extraction_prompt(change_request)
+        
+        try:
+            embedding = await self._aembed(change_request)
+            if embedding is not None and (cached := await self._asemantic_lookup(change_request, embedding)) is not None:
+                return cached
             
-            entities = json.loads(content.strip())
-            return entities if isinstance(entities, list) else []
+            content = await self._achat(
+                _SYS_ENTITY, prompt, temperature=0.1, max_tokens=_ENTITY_MAX_TOKENS,
+                response_format={"type": "json_object"}, model=self.small_deployment_name
+            )
+            entities = self._parse_entities(content)
+            if embedding is not None:
+                # Adding may rewrite the cache file; keep that disk I/O off the event loop
+                await asyncio.to_thread(self.semantic_cache.add, change_request, embedding, entities)
+            return entities
             
         except Exception as e:
             logger.error(f"Entity extraction failed: {e}")
             return self._extract_entities_basic(change_request)
     
+    def extract_entities_from_requests(self, change_requests: List[str]) -> List[List[str]]:
+        """Extract entity names from many change requests, one LLM call per batch."""
+        if not self.enabled:
+            return [self._extract_entities_basic(request) for request in change_requests]
+        
+        results = []
+        for start in range(0, len(change_requests), _ENTITY_BATCH_SIZE):
+            batch = change_requests[start:start + _ENTITY_BATCH_SIZE]
+            prompt = self._create_batch_entity_extraction_prompt(batch)
+            
+            try:
+                content = self._chat(
+                    _SYS_ENTITY, prompt, temperature=0.1,
+                    max_tokens=_ENTITY_BATCH_TOKENS_PER_REQUEST * len(batch),
+                    response_format={"type": "json_object"}, model=self.small_deployment_name
+                )
+                results.extend(self._parse_batch_entities(content, len(batch)))
+                
+            except Exception as e:
+                logger.error(f"Batch entity extraction failed, extracting individually: {e}")
+                results.extend(self.extract_entities_from_request(request) for request in batch)
+        
+        return results
+    
+    async def _batched_plan(self, key: str, plans: Dict[str, str], change_request: str,
+                            impact_analysis: Dict[str, Any]) -> str:
+        """Return the plan for key from the batch results or cache, else create it directly."""
+        plan = plans.get(key) or self.response_cache.get(key)
+        if plan is not None:
+            return plan
+        return await self.acreate_implementation_plan(change_request, impact_analysis)
+    
+    async def _run_batch(self, requests: Dict[str, Dict[str, Any]]) -> Dict[str, str]:
+        """Submit chat completion requests as one Batch API job and return the replies by key."""
+        lines = "\n".join(
+            _dumps({"custom_id": key, "method": "POST", "url": _BATCH_ENDPOINT, "body": request})
+            for key, request in requests.items()
+        )
+        input_file = await self._awith_retry(lambda: self.aclient.files.create(
+            file=("plans.jsonl", lines.encode("utf-8")), purpose="batch"
+        ))
+        batch = await self._awith_retry(lambda: self.aclient.batches.create(
+            input_file_id=input_file.id, endpoint=_BATCH_ENDPOINT, completion_window="24h"
+        ))
+        logger.info(f"Submitted planning batch {batch.id} with {len(requests)} requests")
+        
+        while batch.status not in _BATCH_TERMINAL_STATUSES:
+            await asyncio.sleep(Config.LLM_BATCH_POLL_SECONDS)
+            batch = await self._awith_retry(lambda: self.aclient.batches.retrieve(batch.id))
+        
+        if batch.status != "completed":
+            logger.warning(f"Planning batch {batch.id} ended as {batch.status}")
+        # Expired or cancelled jobs still return the requests that finished
+        if not batch.output_file_id:
+            return {}
+        
+        output = await self._awith_retry(lambda: self.aclient.files.content(batch.output_file_id))
+        replies = {}
+        for line in output.text.splitlines():
+            if not line.strip():
+                continue
+            result = _loads(line)
+            response = result.get("response") or {}
+            if response.get("status_code") != 200:
+                continue
+            content = response["body"]["choices"][0]["message"]["content"].strip()
+            # Cached regardless of temperature: batch replies take hours to regenerate
+            self.response_cache.set(result["custom_id"], content)
+            replies[result["custom_id"]] = content
+        
+        return replies
+    
+    def _organize_many(self, organize: Callable[[Dict[str, Any]], str], contexts: List[Dict[str, Any]]) -> List[str]:
+        """Run organize over contexts on up to max_concurrency threads sharing the pooled client."""
+        if not self.enabled or len(contexts) < 2:
+            return [organize(context) for context in contexts]
+        
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(contexts))) as executor:
+            return list(executor.map(organize, contexts))
+    
+    def _chat(self, system: str, user: str, temperature: float, max_tokens: int,
+              response_format: Optional[Dict[str, str]] = None, model: Optional[str] = None) -> str:
+        """Run a blocking chat completion and return the stripped reply."""
+        request = self._build_request(system, user, temperature, max_tokens, response_format, model)
+        cache_key = self._cache_key(request)
+        if cache_key is not None and (cached := self._cache_lookup(cache_key)) is not None:
+            return cached
+        
+        response = self._with_retry(lambda: self.client.chat.completions.create(**request))
+        self._log_usage(request, response)
+        
+        return self._store_reply(cache_key, response.choices[0].message.content)
+    
+    async def _achat(self, system: str, user: str, temperature: float, max_tokens: int,
+                     response_format: Optional[Dict[str, str]] = None, model: Optional[str] = None) -> str:
+        """Run a chat completion on the async client, capped at max_concurrency in flight."""
+        request = self._build_request(system, user, temperature, max_tokens, response_format, model)
+        cache_key = self._cache_key(request)
+        if cache_key is not None and (cached := self._cache_lookup(cache_key)) is not None:
+            return cached
+        
+        async with self._get_semaphore():
+            response = await self._awith_retry(lambda: self.aclient.chat.completions.create(**request))
+        self._log_usage(request, response)
+        
+        return self._store_reply(cache_key, response.choices[0].message.content)
+    
+    def _chat_stream(self, system: str, user: str, temperature: float, max_tokens: int,
+                     model: Optional[str] = None) -> Iterator[str]:
+        """Stream a chat completion, yielding content deltas as they arrive."""
+        request = self._build_request(system, user, temperature, max_tokens, None, model)
+        cache_key = self._cache_key(request)
+        if cache_key is not None and (cached := self._cache_lookup(cache_key)) is not None:
+            yield cached
+            return
+        
+        parts = []
+        for chunk in self._with_retry(lambda: self.client.chat.completions.create(**request, stream=True)):
+            # Azure sends content-filter chunks without choices
+            if chunk.choices and (delta := chunk.choices[0].delta.content):
+                parts.append(delta)
+                yield delta
+        
+        self._store_reply(cache_key, "".join(parts))
+    
+    async def _achat_stream(self, system: str, user: str, temperature: float, max_tokens: int,
+                            model: Optional[str] = None) -> AsyncIterator[str]:
+        """Async variant of _chat_stream; holds a concurrency slot for the whole stream."""
+        request = self._build_request(system, user, temperature, max_tokens, None, model)
+        cache_key = self._cache_key(request)
+        if cache_key is not None and (cached := self._cache_lookup(cache_key)) is not None:
+            yield cached
+            return
+        
+        parts = []
+        async with self._get_semaphore():
+            stream = await self._awith_retry(lambda: self.aclient.chat.completions.create(**request, stream=True))
+            async for chunk in stream:
+                if chunk.choices and (delta := chunk.choices[0].delta.content):
+                    parts.append(delta)
+                    yield delta
+        
+        self._store_reply(cache_key, "".join(parts))
+    
+    def _with_retry(self, fn: Callable[[], Any]) -> Any:
+        """Call fn, retrying transient API errors with exponential backoff."""
+        for attempt in range(_RETRY_ATTEMPTS):
+            try:
+                return fn()
+            except _RETRYABLE_ERRORS as e:
+                if attempt == _RETRY_ATTEMPTS - 1:
+                    raise
+                delay = _retry_delay(e, attempt)
+                logger.warning(f"LLM request failed ({e}), retrying in {delay:.1f}s")
+                time.sleep(delay)
+    
+    async def _awith_retry(self, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Async variant of _with_retry."""
+        for attempt in range(_RETRY_ATTEMPTS):
+            try:
+                return await fn()
+            except _RETRYABLE_ERRORS as e:
+                if attempt == _RETRY_ATTEMPTS - 1:
+                    raise
+                delay = _retry_delay(e, attempt)
+                logger.warning(f"LLM request failed ({e}), retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+    
+    def _file_sections(self, context: Dict[str, Any]) -> List[Tuple[str, Any]]:
+        """Return the (title, graph data) pairs of the non-empty file context sections."""
+        return [(title, context[key]) for title, key in _FILE_SECTIONS if context.get(key)]
+    
+    def _render_file_sections(self, context: Dict[str, Any], model: Optional[str] = None) -> Iterator[str]:
+        """Yield the file context header and sections; the header rides on the first section."""
+        header = f"# Context for File: {context['file'].get('path', 'Unknown')}\n\n"
+        for title, data in self._file_sections(context):
+            yield header + self._render_file_section(title, data, model)
+            header = ""
+    
+    def _file_section_request(self, title: str, data: Any, model: Optional[str]) -> Tuple[Dict[str, Any], str]:
+        """Build a section render request and its cache key, which depends only on the section's data."""
+        prompt = f"{_FILE_SECTION_INSTRUCTIONS}\n\nSection: {title}\n\nData: {_prompt_json(data)}"
+        request = self._build_request(_SYS_FILE_CONTEXT, prompt, 0.3, 500, None, model)
+        return request, ResponseCache.make_key(request)
+    
+    def _render_file_section(self, title: str, data: Any, model: Optional[str] = None) -> str:
+        """Render one file context section, reusing the cached markdown when its data is unchanged."""
+        request, key = self._file_section_request(title, data, model)
+        if (cached := self.section_cache.get(key)) is not None:
+            self.stats["section_hits"] += 1
+            return cached
+        
+        response = self._with_retry(lambda: self.client.chat.completions.create(**request))
+        section = response.choices[0].message.content.strip() + "\n\n"
+        self.section_cache.set(key, section)
+        return section
+    
+    async def _arender_file_section(self, title: str, data: Any, model: Optional[str] = None) -> str:
+        """Async variant of _render_file_section."""
+        request, key = self._file_section_request(title, data, model)
+        if (cached := self.section_cache.get(key)) is not None:
+            self.stats["section_hits"] += 1
+            return cached
+        
+        async with self._get_semaphore():
+            response = await self._awith_retry(lambda: self.aclient.chat.completions.create(**request))
+        section = response.choices[0].message.content.strip() + "\n\n"
+        self.section_cache.set(key, section)
+        return section
+    
+    def _stream_with_fallback(self, stream: Iterator[str], fallback: Callable[[], str],
+                              buffered: bool = False) -> Iterator[str]:
+        """Relay an LLM stream: fall back if it fails before output (or at all, when buffered), else mark it truncated."""
+        if buffered:
+            try:
+                parts = list(stream)
+            except Exception as e:
+                logger.error(f"LLM processing failed: {e}")
+                yield fallback()
+                return
+            yield from parts
+            return
+        
+        started = False
+        try:
+            for part in stream:
+                started = True
+                yield part
+        except Exception as e:
+            logger.error(f"LLM processing failed: {e}")
+            yield _TRUNCATED_MARKER if started else fallback()
+    
+    async def _astream_with_fallback(self, stream: AsyncIterator[str], fallback: Callable[[], str],
+                                     buffered: bool = False) -> AsyncIterator[str]:
+        """Async variant of _stream_with_fallback."""
+        if buffered:
+            try:
+                parts = [part async for part in stream]
+            except Exception as e:
+                logger.error(f"LLM processing failed: {e}")
+                yield fallback()
+                return
+            for part in parts:
+                yield part
+            return
+        
+        started = False
+        try:
+            async for part in stream:
+                started = True
+                yield part
+        except Exception as e:
+            logger.error(f"LLM processing failed: {e}")
+            yield _TRUNCATED_MARKER if started else fallback()
+    
+    def _build_request(self, system: str, user: str, temperature: float, max_tokens: int,
+                       response_format: Optional[Dict[str, str]], model: Optional[str] = None) -> Dict[str, Any]:
+        """Build the keyword arguments for a chat completion request, on model or the default deployment."""
+        request = {
+            "model": model or self.deployment_name,
+            "messages": [
+                {"role": "system", "content": system},
+                {"role": "user", "content": user}
+            ],
+            "temperature": temperature,
+            "max_tokens": max_tokens
+        }
+        if response_format is not None:
+            request["response_format"] = response_format
+        return request
+    
+    def _log_usage(self, request: Dict[str, Any], response: Any) -> None:
+        """Log completion token usage against the max_tokens budget for tuning."""
+        if (usage := getattr(response, "usage", None)) is not None:
+            logger.debug(
+                f"{request['model']} used {usage.completion_tokens}/{request['max_tokens']} completion tokens"
+            )
+    
+    def _cache_key(self, request: Dict[str, Any]) -> Optional[str]:
+        """Return the response cache key, or None if this request should not be cached."""
+        if request["temperature"] > _CACHEABLE_MAX_TEMPERATURE and not Config.ENABLE_LLM_CACHE:
+            return None
+        return ResponseCache.make_key(request)
+    
+    def _store_reply(self, cache_key: Optional[str], content: str) -> str:
+        """Strip a reply and cache it when the request is cacheable."""
+        content = content.strip()
+        if cache_key is not None:
+            self.response_cache.set(cache_key, content)
+        return content
+    
+    def _cache_lookup(self, cache_key: str) -> Optional[str]:
+        """Look up a cached reply and record the hit or miss."""
+        cached = self.response_cache.get(cache_key)
+        if cached is None:
+            self.stats["cache_misses"] += 1
+        else:
+            self.stats["cache_hits"] += 1
+        return cached
+    
+    def _embed(self, text: str) -> Optional[List[float]]:
+        """Embed text for the semantic cache, or return None if unavailable."""
+        if not self.embedding_deployment:
+            return None
+        
+        try:
+            response = self.client.embeddings.create(model=self.embedding_deployment, input=text)
+            return response.data[0].embedding
+        except Exception as e:
+            logger.warning(f"Embedding failed, skipping semantic cache: {e}")
+            return None
+    
+    async def _aembed(self, text: str) -> Optional[List[float]]:
+        """Async variant of _embed."""
+        if not self.embedding_deployment:
+            return None
+        
+        try:
+            async with self._get_semaphore():
+                response = await self.aclient.embeddings.create(model=self.embedding_deployment, input=text)
+            return response.data[0].embedding
+        except Exception as e:
+            logger.warning(f"Embedding failed, skipping semantic cache: {e}")
+            return None
+    
+    def _semantic_lookup(self, change_request: str, embedding: List[float]) -> Optional[List[str]]:
+        """Look up entities cached for a similar request and record hits."""
+        cached = self.semantic_cache.lookup(change_request, embedding)
+        if cached is not None:
+            self.stats["semantic_hits"] += 1
+        return cached
+    
+    async def _asemantic_lookup(self, change_request: str, embedding: List[float]) -> Optional[List[str]]:
+        """Async variant of _semantic_lookup; the similarity scan runs in a worker thread."""
+        cached = await asyncio.to_thread(self.semantic_cache.lookup, change_request, embedding)
+        if cached is not None:
+            self.stats["semantic_hits"] += 1
+        return cached
+    
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """Return the concurrency semaphore for the running event loop."""
+        # Semaphores bind to a loop on Python < 3.10, so keep one per loop
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphore_loop = loop
+        return self._semaphore
+    
+    def _create_entity_extraction_prompt(self, change_request: str) -> str:
+        """Create prompt for entity extraction."""
+        return f"""{_ENTITY_INSTRUCTIONS}
+
+Change request: {change_request}"""
+    
+    def _create_batch_entity_extraction_prompt(self, change_requests: List[str]) -> str:
+        """Create prompt for extracting entities from several change requests at once."""
+        requests = "\n\n".join(f"[{i}]: {request}" for i, request in enumerate(change_requests))
+        return f"""{_BATCH_ENTITY_INSTRUCTIONS}
+
+{requests}"""
+    
+    def _parse_batch_entities(self, content: str, count: int) -> List[List[str]]:
+        """Parse the index-keyed entity lists returned for a batch."""
+        parsed = _loads(content)
+        results = []
+        for i in range(count):
+            entities = parsed.get(str(i), [])
+            results.append(entities if isinstance(entities, list) else [])
+        return results
+    
+    def _parse_entities(self, content: str) -> List[str]:
+        """Parse the entity list returned by the LLM."""
+        entities = _loads(content).get("entities", [])
+        return entities if isinstance(entities, list) else []
+    
     def _create_file_context_prompt(self, context: Dict[str, Any]) -> str:
         """Create prompt for file context organization."""
-        return f"""Organize this file context into clear Markdown:
+        return f"""{_FILE_CONTEXT_INSTRUCTIONS}
 
 File: {context['file'].get('path', 'Unknown')}
 
-Contents (classes/functions): {json.dumps(context.get('contents', []), indent=2)}
+Contents (classes/functions): {_prompt_json(context.get('contents', []))}
 
-Imports: {json.dumps(context.get('imports', []), indent=2)}
+Imports: {_prompt_json(context.get('imports', []))}
 
-Imported by: {json.dumps(context.get('importers', []), indent=2)}
+Imported by: {_prompt_json(context.get('importers', []))}
 
-Documentation: {json.dumps(context.get('documentation', []), indent=2)}
-
-Description: {json.dumps(context.get('description', {}), indent=2)}
-
-Create a well-structured Markdown document with:
-1. File overview
-2. What it contains (classes, functions)
-3. Dependencies (what it imports)
-4. Usage (what imports it)
-5. Related documentation
-6. Any available descriptions
+Documentation: {_prompt_json(context.get('documentation', []))}
 
-Use clear headers and formatting."""
+Description: {_prompt_json(context.get('description', {}))}"""
     
     def _create_symbol_context_prompt(self, context: Dict[str, Any]) -> str:
         """Create prompt for symbol context organization."""
         symbol = context['symbol']
-        return f"""Organize this symbol context into clear Markdown:
+        labels = symbol.get('_labels', [])
+        return f"""{_SYMBOL_CONTEXT_INSTRUCTIONS}
 
-Symbol: {symbol.get('name', 'Unknown')} (Type: {', '.join(symbol.get('_labels', []))})
+Symbol: {symbol.get('name', 'Unknown')} (Type: {', '.join(labels)})
 
-File: {json.dumps(context.get('file', {}), indent=2)}
+File: {_prompt_json(context.get('file', {}))}
 
 Inheritance: 
-- Parents: {json.dumps(context.get('parents', []), indent=2)}
-- Children: {json.dumps(context.get('children', []), indent=2)}
-- Interfaces: {json.dumps(context.get('interfaces', []), indent=2)}
+- Parents: {_prompt_json(context.get('parents', []))}
+- Children: {_prompt_json(context.get('children', []))}
+- Interfaces: {_prompt_json(context.get('interfaces', []))}
 
 Members:
-- Methods: {json.dumps(context.get('methods', []), indent=2)}
-- Attributes: {json.dumps(context.get('attributes', []), indent=2)}
+- Methods: {_prompt_json(context.get('methods', []))}
+- Attributes: {_prompt_json(context.get('attributes', []))}
 
 Usage:
-- Called by: {json.dumps(context.get('callers', []), indent=2)}
-- Calls: {json.dumps(context.get('callees', []), indent=2)}
-- Referenced by: {json.dumps(context.get('referencers', []), indent=2)}
-
-Documentation: {json.dumps(context.get('documentation', []), indent=2)}
+- Called by: {_prompt_json(context.get('callers', []))}
+- Calls: {_prompt_json(context.get('callees', []))}
+- Referenced by: {_prompt_json(context.get('referencers', []))}
 
-Description: {json.dumps(context.get('description', {}), indent=2)}
+Documentation: {_prompt_json(context.get('documentation', []))}
 
-Create a well-structured Markdown document that explains:
-1. What the symbol is and where it's defined
-2. Its inheritance/implementation hierarchy
-3. Its members (for classes)
-4. How it's used in the codebase
-5. Related documentation"""
+Description: {_prompt_json(context.get('description', {}))}"""
     
     def _create_implementation_plan_prompt(self, change_request: str, impact_analysis: Dict[str, Any]) -> str:
         """Create prompt for implementation plan generation."""
-        return f"""Create an implementation plan for this change request:
+        return f"""{_PLAN_INSTRUCTIONS}
 
 Change Request: {change_request}
 
 Impact Analysis:
-{json.dumps(impact_analysis, indent=2)}
-
-Create a detailed implementation plan that includes:
-1. Summary of the change
-2. Impact analysis (affected components)
-3. Step-by-step implementation plan
-4. Files to create/modify/delete
-5. Required tests
-6. Documentation updates
-7. Dependencies to consider
-
-Format as clear Markdown with numbered steps and specific file paths."""
+{_prompt_json(impact_analysis)}"""
     
     def _build_file_context_markdown(self, context: Dict[str, Any]) -> str:
         """Build file context markdown without LLM."""
-        file_info = context["file"]
-        md = f"# Context for File: {file_info.get('path', 'Unknown')}\n\n"
+        path = context["file"].get("path", "Unknown")
+        parts = [f"# Context for File: {path}\n\n"]
         
         if desc := context.get("description"):
-            md += f"## Overview\n{desc.get('description', 'No description available')}\n\n"
+            parts.append(f"## Overview\n{desc.get('description', 'No description available')}\n\n")
         
         if contents := context.get("contents"):
-            md += "## Contains\n"
-            for item in contents:
-                item_type = item.get("_labels", ["Unknown"])[0]
-                md += f"- **{item_type}**: {item.get('name', 'Unknown')}\n"
-            md += "\n"
+            parts.append("## Contains\n")
+            parts.extend(
+                f"- **{item.get('_labels', ['Unknown'])[0]}**: {item.get('name', 'Unknown')}\n"
+                for item in contents
+            )
+            parts.append("\n")
         
         if imports := context.get("imports"):
-            md += "## Dependencies\n"
-            for imp in imports:
-                md += f"- {imp.get('name', imp.get('path', 'Unknown'))}\n"
-            md += "\n"
+            parts.append("## Dependencies\n")
+            parts.extend(f"- {imp.get('name', imp.get('path', 'Unknown'))}\n" for imp in imports)
+            parts.append("\n")
         
         if importers := context.get("importers"):
-            md += "## Used By\n"
-            for imp in importers:
-                md += f"- {imp.get('path', 'Unknown')}\n"
-            md += "\n"
+            parts.append("## Used By\n")
+            parts.extend(f"- {imp.get('path', 'Unknown')}\n" for imp in importers)
+            parts.append("\n")
         
-        return md
+        return "".join(parts)
     
     def _build_symbol_context_markdown(self, context: Dict[str, Any]) -> str:
         """Build symbol context markdown without LLM."""
         symbol = context["symbol"]
         symbol_type = ", ".join(symbol.get("_labels", ["Unknown"]))
         
-        md = f"# Context for Symbol: {symbol.get('name', 'Unknown')}\n\n"
-        md += f"**Type**: {symbol_type}\n"
+        parts = [
+            f"# Context for Symbol: {symbol.get('name', 'Unknown')}\n\n",
+            f"**Type**: {symbol_type}\n"
+        ]
         
         if file_info := context.get("file"):
-            md += f"**Location**: {file_info.get('path', 'Unknown')}\n"
+            parts.append(f"**Location**: {file_info.get('path', 'Unknown')}\n")
         
         if desc := context.get("description"):
-            md += f"\n## Description\n{desc.get('description', 'No description available')}\n"
+            parts.append(f"\n## Description\n{desc.get('description', 'No description available')}\n")
         
         # Add other sections...
-        return md
+        return "".join(parts)
     
     def _build_basic_implementation_plan(self, change_request: str, impact_analysis: Dict[str, Any]) -> str:
         """Build basic implementation plan without LLM."""
-        md = "# Implementation Plan\n\n"
-        md += f"## Change Request\n{change_request}\n\n"
-        md += "## Impact Analysis\n"
+        parts = [
+            "# Implementation Plan\n\n",
+            f"## Change Request\n{change_request}\n\n",
+            "## Impact Analysis\n"
+        ]
         
         for entity, impact in impact_analysis.items():
-            md += f"\n### {entity}\n"
+            parts.append(f"\n### {entity}\n")
             if deps := impact.get("dependents"):
-                md += f"- **Dependents**: {len(deps)} items\n"
+                parts.append(f"- **Dependents**: {len(deps)} items\n")
             if files := impact.get("containing_files"):
-                md += f"- **Files**: {', '.join(f.get('path', 'Unknown') for f in files)}\n"
+                parts.append(f"- **Files**: {', '.join(f.get('path', 'Unknown') for f in files)}\n")
         
-        return md
+        return "".join(parts)
     
     def _extract_entities_basic(self, change_request: str) -> List[str]:
         """Basic entity extraction without LLM."""
-        # Simple extraction based on common patterns
-        import re
-        
-        # Look for quoted strings, CamelCase, snake_case
-        patterns = [
-            r'"([^"]+)"',  # Quoted strings
-            r'`([^`]+)`',  # Backtick strings
-            r'\b([A-Z][a-zA-Z0-9]+)\b',  # CamelCase
-            r'\b([a-z_][a-z0-9_]+)\b'  # snake_case
-        ]
-        
-        entities = set()
-        for pattern in patterns:
-            matches = re.findall(pattern, change_request)
-            entities.update(matches)
+        # Single pass over quoted strings, CamelCase and snake_case names
+        pattern = _ENTITY_RE
+        if _ENTITY_RE2 is not None and len(change_request) >= _RE2_MIN_LENGTH:
+            pattern = _ENTITY_RE2
         
-        # Filter out common words
-        common_words = {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for'}
-        entities = [e for e in entities if e.lower() not in common_words and len(e) > 2]
+        seen = set()
+        entities = []
+        for match in pattern.finditer(change_request):
+            entity = match[match.lastgroup]
+            if len(entity) > 2 and entity not in seen and entity.lower() not in _COMMON_WORDS:
+                seen.add(entity)
+                entities.append(entity)
+                if len(entities) == _MAX_BASIC_ENTITIES:
+                    break
         
-        return list(entities)[:20]  # Limit to 20 entities
\ No newline at end of file
+        return entities
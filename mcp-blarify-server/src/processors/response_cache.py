@@ -0,0 +1,273 @@
+"""Exact and semantic caches for LLM responses."""
+
+import atexit
+import hashlib
+import json
+import logging
+import math
+import operator
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseCache:
+    """Caches LLM replies in memory with an optional Redis or on-disk JSON backend."""
+    
+    def __init__(self, cache_dir: Optional[str] = None, ttl_seconds: int = 3600, max_memory_entries: int = 256,
+                 redis_url: Optional[str] = None, namespace: str = "llm"):
+        """Initialize the cache; entries persist to Redis when redis_url is given, else to cache_dir."""
+        self.cache_dir = cache_dir
+        self.ttl_seconds = ttl_seconds
+        self.max_memory_entries = max_memory_entries
+        self.namespace = namespace
+        self._memory: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._redis = None
+        if redis_url:
+            if redis is None:
+                logger.warning("LLM_CACHE_REDIS_URL is set but the redis package is not installed")
+            else:
+                self._redis = redis.Redis.from_url(redis_url)
+    
+    @staticmethod
+    def make_key(request: Dict[str, Any]) -> str:
+        """Build the cache key for a chat completion request (deployment, messages, sampling options)."""
+        payload = json.dumps(request, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached reply for key, or None if missing or expired."""
+        now = time.time()
+        
+        entry = self._memory.get(key)
+        if entry is None:
+            entry = self._read_entry(key)
+            if entry is None:
+                return None
+        
+        expires_at, content = entry
+        if expires_at <= now:
+            self._memory.pop(key, None)
+            self._delete_entry(key)
+            return None
+        
+        self._remember(key, entry)
+        return content
+    
+    def set(self, key: str, content: str, ttl: Optional[int] = None) -> None:
+        """Store a reply under key for ttl seconds (defaults to the cache TTL)."""
+        entry = (time.time() + (self.ttl_seconds if ttl is None else ttl), content)
+        self._remember(key, entry)
+        self._write_entry(key, entry)
+    
+    def _remember(self, key: str, entry: Tuple[float, str]) -> None:
+        """Insert entry into the in-memory LRU, evicting the oldest if full."""
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+    
+    def _entry_path(self, key: str) -> str:
+        """Return the on-disk path for key."""
+        return os.path.join(self.cache_dir, f"{key}.json")
+    
+    def _redis_key(self, key: str) -> str:
+        """Return the Redis key for key, namespaced so caches can share a server."""
+        return f"cue:{self.namespace}:{key}"
+    
+    def _read_entry(self, key: str) -> Optional[Tuple[float, str]]:
+        """Load an entry from the persistent backend if one is enabled."""
+        if self._redis is not None:
+            try:
+                raw = self._redis.get(self._redis_key(key))
+                if raw is None:
+                    return None
+                data: Dict[str, Any] = json.loads(raw)
+                return data["expires_at"], data["content"]
+            except (redis.RedisError, ValueError, KeyError) as e:
+                logger.warning(f"Ignoring unreadable LLM cache entry {key}: {e}")
+                return None
+        
+        if not self.cache_dir:
+            return None
+        
+        try:
+            with open(self._entry_path(key), "r", encoding="utf-8") as f:
+                data: Dict[str, Any] = json.load(f)
+            return data["expires_at"], data["content"]
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable LLM cache entry {key}: {e}")
+            return None
+    
+    def _delete_entry(self, key: str) -> None:
+        """Remove an expired entry from the disk backend; Redis expires entries itself."""
+        if self._redis is not None or not self.cache_dir:
+            return
+        
+        try:
+            os.remove(self._entry_path(key))
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Failed to remove expired LLM cache entry {key}: {e}")
+    
+    def _write_entry(self, key: str, entry: Tuple[float, str]) -> None:
+        """Persist an entry to the persistent backend if one is enabled."""
+        expires_at, content = entry
+        if self._redis is not None:
+            try:
+                # Redis expires the entry itself; expires_at is kept for the memory tier
+                self._redis.set(
+                    self._redis_key(key),
+                    json.dumps({"expires_at": expires_at, "content": content}),
+                    ex=max(1, math.ceil(expires_at - time.time()))
+                )
+            except redis.RedisError as e:
+                logger.warning(f"Failed to persist LLM cache entry {key}: {e}")
+            return
+        
+        if not self.cache_dir:
+            return
+        
+        try:
+            _write_json_atomic(self._entry_path(key), {"expires_at": expires_at, "content": content})
+        except OSError as e:
+            logger.warning(f"Failed to persist LLM cache entry {key}: {e}")
+
+
+# Code-like tokens (quoted names, dotted paths, snake_case, CamelCase) that must
+# match exactly before a semantic hit is trusted
+_IDENTIFIER_RE = re.compile(
+    r'`([^`]+)`|"([^"]+)"'
+    r'|\b([A-Za-z_][A-Za-z0-9_]*(?:\.[A-Za-z0-9_]+)+)\b'
+    r'|\b([a-z0-9]+_[a-z0-9_]+)\b'
+    r'|\b([A-Z][a-z0-9]+[A-Z][A-Za-z0-9]*)\b'
+)
+
+
+class SemanticCache:
+    """Caches entity lists for change requests, matched by embedding similarity."""
+    
+    def __init__(self, cache_path: Optional[str] = None, threshold: float = 0.92, max_entries: int = 512,
+                 save_every: int = 16):
+        """Initialize the cache; entries persist to cache_path every save_every adds and at exit."""
+        self.cache_path = cache_path
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.save_every = save_every
+        # (unit-length embedding, code identifiers in the request, cached entities)
+        self._entries: List[Tuple[List[float], FrozenSet[str], List[str]]] = []
+        self._unsaved = 0
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._load()
+        if self.cache_path:
+            atexit.register(self.flush)
+    
+    def lookup(self, text: str, embedding: List[float]) -> Optional[List[str]]:
+        """Return the entities cached for the most similar request above the threshold."""
+        with self._lock:
+            entries = list(self._entries)
+        if not entries:
+            return None
+        
+        query = _normalize(embedding)
+        best_score = self.threshold
+        best = None
+        for vector, identifiers, entities in entries:
+            score = sum(map(operator.mul, query, vector))
+            if score >= best_score:
+                best_score = score
+                best = (identifiers, entities)
+        
+        # Paraphrases naming different code entities embed closely; reject those
+        if best is None or best[0] != _identifiers(text):
+            return None
+        return list(best[1])
+    
+    def add(self, text: str, embedding: List[float], entities: List[str]) -> None:
+        """Cache the entities extracted for a request, persisting once save_every adds are pending."""
+        with self._lock:
+            self._entries.append((_normalize(embedding), _identifiers(text), list(entities)))
+            if len(self._entries) > self.max_entries:
+                del self._entries[0]
+            self._unsaved += 1
+            due = self._unsaved >= self.save_every
+        if due:
+            self.flush()
+    
+    def flush(self) -> None:
+        """Persist pending entries if the backend is enabled."""
+        if not self.cache_path:
+            return
+        
+        # Writers take turns so an older snapshot can never replace a newer one
+        with self._write_lock:
+            with self._lock:
+                if not self._unsaved:
+                    return
+                self._unsaved = 0
+                data = [
+                    {"embedding": vector, "identifiers": sorted(identifiers), "entities": entities}
+                    for vector, identifiers, entities in self._entries
+                ]
+            try:
+                _write_json_atomic(self.cache_path, data)
+            except OSError as e:
+                logger.warning(f"Failed to persist semantic cache {self.cache_path}: {e}")
+    
+    def _load(self) -> None:
+        """Load persisted entries if the backend is enabled."""
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return
+        
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self._entries = [
+                (entry["embedding"], frozenset(entry["identifiers"]), entry["entities"])
+                for entry in data[-self.max_entries:]
+            ]
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable semantic cache {self.cache_path}: {e}")
+
+
+def _write_json_atomic(path: str, data: Any) -> None:
+    """Replace path with data as JSON, via a temp file unique to this writer."""
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+    except OSError:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _normalize(vector: List[float]) -> List[float]:
+    """Scale a vector to unit length so cosine similarity is a dot product."""
+    norm = math.sqrt(sum(x * x for x in vector))
+    return [x / norm for x in vector] if norm else list(vector)
+
+
+def _identifiers(text: str) -> FrozenSet[str]:
+    """Extract the code-like tokens a cached answer must agree on."""
+    return frozenset(next(filter(None, match)) for match in _IDENTIFIER_RE.findall(text))
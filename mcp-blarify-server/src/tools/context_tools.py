@@ -6,7 +6,7 @@ from neo4j import Driver
 
 from ..processors.graph_traversal import GraphTraversal
 from ..processors.context_builder import ContextBuilder
-from ..processors.llm_processor import LLMProcessor
+from ..processors.llm_processor import get_llm_processor
 
 logger = logging.getLogger(__name__)
 
@@ -19,7 +19,7 @@ class ContextTools:
         self.driver = driver
         self.graph_traversal = GraphTraversal(driver)
         self.context_builder = ContextBuilder()
-        self.llm_processor = LLMProcessor()
+        self.llm_processor = get_llm_processor()
     
     async def get_context_for_files(self, file_paths: List[str]) -> str:
         """
@@ -51,11 +51,8 @@ class ContextTools:
             
             # Build structured context
             if self.llm_processor.enabled:
-                # Use LLM to organize the contexts
-                combined_context = []
-                for context in file_contexts:
-                    organized = self.llm_processor.organize_file_context(context)
-                    combined_context.append(organized)
+                # Use LLM to organize the contexts concurrently
+                combined_context = await self.llm_processor.aorganize_files(file_contexts)
                 
                 result = "# Context for Files\n\n" + "\n---\n\n".join(combined_context)
             else:
@@ -109,14 +106,12 @@ class ContextTools:
             
             # Build structured context
             if self.llm_processor.enabled:
-                # Use LLM to organize the context
-                main_context = self.llm_processor.organize_symbol_context(context)
+                # Use LLM to organize the main and related contexts concurrently
+                main_context, *related_parts = await self.llm_processor.aorganize_symbols(
+                    [context] + related_contexts
+                )
                 
-                if related_contexts:
-                    related_parts = []
-                    for rc in related_contexts:
-                        related_parts.append(self.llm_processor.organize_symbol_context(rc))
-                    
+                if related_parts:
                     result = main_context + "\n\n---\n\n## Other Matches\n\n" + "\n---\n\n".join(related_parts)
                 else:
                     result = main_context
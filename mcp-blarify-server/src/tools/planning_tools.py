@@ -6,7 +6,7 @@ from neo4j import Driver
 
 from ..processors.graph_traversal import GraphTraversal
 from ..processors.context_builder import ContextBuilder
-from ..processors.llm_processor import LLMProcessor
+from ..processors.llm_processor import get_llm_processor
 
 logger = logging.getLogger(__name__)
 
@@ -19,7 +19,7 @@ class PlanningTools:
         self.driver = driver
         self.graph_traversal = GraphTraversal(driver)
         self.context_builder = ContextBuilder()
-        self.llm_processor = LLMProcessor()
+        self.llm_processor = get_llm_processor()
     
     async def build_plan_for_change(self, change_request: str) -> str:
         """
@@ -35,7 +35,7 @@ class PlanningTools:
         
         try:
             # Extract entities from the change request
-            entities = self.llm_processor.extract_entities_from_request(change_request)
+            entities = await self.llm_processor.aextract_entities_from_request(change_request)
             logger.info(f"Extracted entities: {entities}")
             
             if not entities:
@@ -57,7 +57,7 @@ class PlanningTools:
             
             # Generate implementation plan
             if self.llm_processor.enabled:
-                plan = self.llm_processor.create_implementation_plan(
+                plan = await self.llm_processor.acreate_implementation_plan(
                     change_request,
                     impact_analysis
                 )
@@ -1,13 +1,146 @@
 """Set up a test Blarify graph in Neo4j for integration testing."""
 
 import logging
+from collections import defaultdict
 from neo4j import GraphDatabase
+from neo4j.exceptions import ServiceUnavailable
 import time
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+# Temporary label/property used to wire relationships while the graph is built
+_SETUP_LABEL = "TEST_SETUP"
+_SETUP_KEY = "setup_key"
+_SETUP_INDEX = "test_setup_key"
+
+_PROJECT = "file:///project"
+
+# (key, labels, properties) for every node in the test graph
+_NODES = [
+    # Folder structure
+    ("root", "FOLDER", {"path": _PROJECT, "name": "project"}),
+    ("src", "FOLDER", {"path": f"{_PROJECT}/src", "name": "src"}),
+    ("services", "FOLDER", {"path": f"{_PROJECT}/src/services", "name": "services"}),
+    ("controllers", "FOLDER", {"path": f"{_PROJECT}/src/controllers", "name": "controllers"}),
+    ("models", "FOLDER", {"path": f"{_PROJECT}/src/models", "name": "models"}),
+    ("tests", "FOLDER", {"path": f"{_PROJECT}/tests", "name": "tests"}),
+    ("docs", "FOLDER", {"path": f"{_PROJECT}/docs", "name": "docs"}),
+    
+    # User model file
+    ("user_model_file", "FILE", {"path": f"{_PROJECT}/src/models/user.py", "name": "user.py", "extension": ".py"}),
+    ("user_class", "CLASS", {"name": "User", "path": f"{_PROJECT}/src/models/user.py", "line": 10}),
+    ("user_init", "METHOD:FUNCTION", {"name": "__init__", "path": f"{_PROJECT}/src/models/user.py", "line": 15}),
+    ("user_validate", "METHOD:FUNCTION", {"name": "validate", "path": f"{_PROJECT}/src/models/user.py", "line": 25}),
+    
+    # User service file
+    ("user_service_file", "FILE", {"path": f"{_PROJECT}/src/services/user_service.py", "name": "user_service.py", "extension": ".py"}),
+    ("base_service", "CLASS", {"name": "BaseService", "path": f"{_PROJECT}/src/services/base.py", "line": 5}),
+    ("user_service", "CLASS", {"name": "UserService", "path": f"{_PROJECT}/src/services/user_service.py", "line": 20}),
+    ("create_user", "METHOD:FUNCTION", {"name": "create_user", "path": f"{_PROJECT}/src/services/user_service.py", "line": 30}),
+    ("get_user", "METHOD:FUNCTION", {"name": "get_user", "path": f"{_PROJECT}/src/services/user_service.py", "line": 45}),
+    ("update_user", "METHOD:FUNCTION", {"name": "update_user", "path": f"{_PROJECT}/src/services/user_service.py", "line": 60}),
+    
+    # Auth service file
+    ("auth_service_file", "FILE", {"path": f"{_PROJECT}/src/services/auth_service.py", "name": "auth_service.py", "extension": ".py"}),
+    ("auth_service", "CLASS", {"name": "AuthService", "path": f"{_PROJECT}/src/services/auth_service.py", "line": 15}),
+    ("login", "METHOD:FUNCTION", {"name": "login", "path": f"{_PROJECT}/src/services/auth_service.py", "line": 25}),
+    ("verify_token", "METHOD:FUNCTION", {"name": "verify_token", "path": f"{_PROJECT}/src/services/auth_service.py", "line": 40}),
+    
+    # User controller file
+    ("user_controller_file", "FILE", {"path": f"{_PROJECT}/src/controllers/user_controller.py", "name": "user_controller.py", "extension": ".py"}),
+    ("user_controller", "CLASS", {"name": "UserController", "path": f"{_PROJECT}/src/controllers/user_controller.py", "line": 10}),
+    ("handle_create", "METHOD:FUNCTION", {"name": "handle_create", "path": f"{_PROJECT}/src/controllers/user_controller.py", "line": 20}),
+    ("handle_get", "METHOD:FUNCTION", {"name": "handle_get", "path": f"{_PROJECT}/src/controllers/user_controller.py", "line": 35}),
+    
+    # LLM descriptions (node_id is filled in once the targets exist)
+    ("user_service_desc", "DESCRIPTION", {"description": "Core service for user management operations. Handles CRUD operations for users with validation and security checks."}),
+    ("auth_service_desc", "DESCRIPTION", {"description": "Authentication service handling user login, token generation, and session management."}),
+    
+    # Documentation and concepts
+    ("readme", "DOCUMENTATION_FILE", {"path": f"{_PROJECT}/README.md", "name": "README.md", "doc_type": "md"}),
+    ("api_doc", "DOCUMENTATION_FILE", {"path": f"{_PROJECT}/docs/api.md", "name": "api.md", "doc_type": "md"}),
+    ("auth_concept", "CONCEPT", {"name": "JWT Authentication", "description": "JSON Web Token based authentication system"}),
+    ("rest_concept", "CONCEPT", {"name": "REST API", "description": "RESTful API design patterns"}),
+    
+    # Filesystem nodes
+    ("fs_src", "FILESYSTEM_DIRECTORY", {"path": "/project/src", "name": "src", "size": 4096}),
+    ("fs_services", "FILESYSTEM_DIRECTORY", {"path": "/project/src/services", "name": "services", "size": 4096}),
+    ("fs_user_service", "FILESYSTEM_FILE", {"path": "/project/src/services/user_service.py", "name": "user_service.py", "size": 2048, "extension": "py"}),
+    
+    # Test files
+    ("test_file", "FILE", {"path": f"{_PROJECT}/tests/test_user_service.py", "name": "test_user_service.py", "extension": ".py"}),
+]
+
+# (source key, relationship type, target key)
+_RELATIONSHIPS = [
+    # Folder structure
+    ("root", "CONTAINS", "src"),
+    ("root", "CONTAINS", "tests"),
+    ("root", "CONTAINS", "docs"),
+    ("src", "CONTAINS", "services"),
+    ("src", "CONTAINS", "controllers"),
+    ("src", "CONTAINS", "models"),
+    
+    # Files in folders
+    ("models", "CONTAINS", "user_model_file"),
+    ("services", "CONTAINS", "user_service_file"),
+    ("services", "CONTAINS", "auth_service_file"),
+    ("controllers", "CONTAINS", "user_controller_file"),
+    ("tests", "CONTAINS", "test_file"),
+    ("docs", "CONTAINS", "readme"),
+    ("docs", "CONTAINS", "api_doc"),
+    
+    # Code structure
+    ("user_model_file", "CONTAINS", "user_class"),
+    ("user_class", "HAS_METHOD", "user_init"),
+    ("user_class", "HAS_METHOD", "user_validate"),
+    ("user_service_file", "CONTAINS", "user_service"),
+    ("user_service", "INHERITS_FROM", "base_service"),
+    ("user_service", "HAS_METHOD", "create_user"),
+    ("user_service", "HAS_METHOD", "get_user"),
+    ("user_service", "HAS_METHOD", "update_user"),
+    ("auth_service_file", "CONTAINS", "auth_service"),
+    ("auth_service", "HAS_METHOD", "login"),
+    ("auth_service", "HAS_METHOD", "verify_token"),
+    ("user_controller_file", "CONTAINS", "user_controller"),
+    ("user_controller", "HAS_METHOD", "handle_create"),
+    ("user_controller", "HAS_METHOD", "handle_get"),
+    
+    # Usage and calls
+    ("user_service", "USES", "user_class"),
+    ("user_controller", "USES", "user_service"),
+    ("auth_service", "USES", "user_service"),
+    ("create_user", "CALLS", "user_validate"),
+    ("login", "CALLS", "get_user"),
+    ("handle_create", "CALLS", "create_user"),
+    
+    # Imports
+    ("user_service_file", "IMPORTS", "user_model_file"),
+    ("auth_service_file", "IMPORTS", "user_service_file"),
+    ("user_controller_file", "IMPORTS", "user_service_file"),
+    
+    # LLM descriptions
+    ("user_service_desc", "DESCRIBES", "user_service"),
+    ("auth_service_desc", "DESCRIBES", "auth_service"),
+    
+    # Documentation
+    ("readme", "CONTAINS_CONCEPT", "auth_concept"),
+    ("api_doc", "CONTAINS_CONCEPT", "rest_concept"),
+    ("auth_concept", "DOCUMENTS", "auth_service"),
+    ("rest_concept", "DOCUMENTS", "user_controller"),
+    
+    # Filesystem
+    ("fs_src", "HAS_CHILD", "fs_services"),
+    ("fs_services", "HAS_CHILD", "fs_user_service"),
+    ("fs_user_service", "REPRESENTS", "user_service_file"),
+    
+    # Tests
+    ("test_file", "TESTS", "user_service"),
+]
+
+
 class TestGraphSetup:
     """Sets up a test graph that mimics Blarify output."""
     
@@ -26,311 +159,51 @@ class TestGraphSetup:
     
     def create_test_graph(self):
         """Create a test graph with various node types and relationships."""
+        nodes_by_labels = defaultdict(list)
+        for key, labels, props in _NODES:
+            nodes_by_labels[labels].append({"key": key, "props": props})
+        
+        relationships_by_type = defaultdict(list)
+        for source, rel_type, target in _RELATIONSHIPS:
+            relationships_by_type[rel_type].append({"source": source, "target": target})
+        
         with self.driver.session() as session:
-            # Create folder structure
-            session.run("""
-                CREATE (root:FOLDER {path: 'file:///project', name: 'project'})
-                CREATE (src:FOLDER {path: 'file:///project/src', name: 'src'})
-                CREATE (services:FOLDER {path: 'file:///project/src/services', name: 'services'})
-                CREATE (controllers:FOLDER {path: 'file:///project/src/controllers', name: 'controllers'})
-                CREATE (models:FOLDER {path: 'file:///project/src/models', name: 'models'})
-                CREATE (tests:FOLDER {path: 'file:///project/tests', name: 'tests'})
-                CREATE (docs:FOLDER {path: 'file:///project/docs', name: 'docs'})
-                
-                CREATE (root)-[:CONTAINS]->(src)
-                CREATE (root)-[:CONTAINS]->(tests)
-                CREATE (root)-[:CONTAINS]->(docs)
-                CREATE (src)-[:CONTAINS]->(services)
-                CREATE (src)-[:CONTAINS]->(controllers)
-                CREATE (src)-[:CONTAINS]->(models)
-            """)
-            logger.info("Created folder structure")
-            
-            # Create files and code nodes
-            session.run("""
-                // User model file
-                CREATE (user_model_file:FILE {
-                    path: 'file:///project/src/models/user.py',
-                    name: 'user.py',
-                    extension: '.py'
-                })
-                CREATE (user_class:CLASS {
-                    name: 'User',
-                    path: 'file:///project/src/models/user.py',
-                    line: 10
-                })
-                CREATE (user_init:METHOD:FUNCTION {
-                    name: '__init__',
-                    path: 'file:///project/src/models/user.py',
-                    line: 15
-                })
-                CREATE (user_validate:METHOD:FUNCTION {
-                    name: 'validate',
-                    path: 'file:///project/src/models/user.py',
-                    line: 25
-                })
-                
-                CREATE (user_model_file)-[:CONTAINS]->(user_class)
-                CREATE (user_class)-[:HAS_METHOD]->(user_init)
-                CREATE (user_class)-[:HAS_METHOD]->(user_validate)
-                
-                // User service file
-                CREATE (user_service_file:FILE {
-                    path: 'file:///project/src/services/user_service.py',
-                    name: 'user_service.py',
-                    extension: '.py'
-                })
-                CREATE (base_service:CLASS {
-                    name: 'BaseService',
-                    path: 'file:///project/src/services/base.py',
-                    line: 5
-                })
-                CREATE (user_service:CLASS {
-                    name: 'UserService',
-                    path: 'file:///project/src/services/user_service.py',
-                    line: 20
-                })
-                CREATE (create_user:METHOD:FUNCTION {
-                    name: 'create_user',
-                    path: 'file:///project/src/services/user_service.py',
-                    line: 30
-                })
-                CREATE (get_user:METHOD:FUNCTION {
-                    name: 'get_user',
-                    path: 'file:///project/src/services/user_service.py',
-                    line: 45
-                })
-                CREATE (update_user:METHOD:FUNCTION {
-                    name: 'update_user',
-                    path: 'file:///project/src/services/user_service.py',
-                    line: 60
-                })
-                
-                CREATE (user_service_file)-[:CONTAINS]->(user_service)
-                CREATE (user_service)-[:INHERITS_FROM]->(base_service)
-                CREATE (user_service)-[:HAS_METHOD]->(create_user)
-                CREATE (user_service)-[:HAS_METHOD]->(get_user)
-                CREATE (user_service)-[:HAS_METHOD]->(update_user)
-                
-                // Auth service file
-                CREATE (auth_service_file:FILE {
-                    path: 'file:///project/src/services/auth_service.py',
-                    name: 'auth_service.py',
-                    extension: '.py'
-                })
-                CREATE (auth_service:CLASS {
-                    name: 'AuthService',
-                    path: 'file:///project/src/services/auth_service.py',
-                    line: 15
-                })
-                CREATE (login:METHOD:FUNCTION {
-                    name: 'login',
-                    path: 'file:///project/src/services/auth_service.py',
-                    line: 25
-                })
-                CREATE (verify_token:METHOD:FUNCTION {
-                    name: 'verify_token',
-                    path: 'file:///project/src/services/auth_service.py',
-                    line: 40
-                })
-                
-                CREATE (auth_service_file)-[:CONTAINS]->(auth_service)
-                CREATE (auth_service)-[:HAS_METHOD]->(login)
-                CREATE (auth_service)-[:HAS_METHOD]->(verify_token)
-                
-                // User controller file
-                CREATE (user_controller_file:FILE {
-                    path: 'file:///project/src/controllers/user_controller.py',
-                    name: 'user_controller.py',
-                    extension: '.py'
-                })
-                CREATE (user_controller:CLASS {
-                    name: 'UserController',
-                    path: 'file:///project/src/controllers/user_controller.py',
-                    line: 10
-                })
-                CREATE (handle_create:METHOD:FUNCTION {
-                    name: 'handle_create',
-                    path: 'file:///project/src/controllers/user_controller.py',
-                    line: 20
-                })
-                CREATE (handle_get:METHOD:FUNCTION {
-                    name: 'handle_get',
-                    path: 'file:///project/src/controllers/user_controller.py',
-                    line: 35
-                })
-                
-                CREATE (user_controller_file)-[:CONTAINS]->(user_controller)
-                CREATE (user_controller)-[:HAS_METHOD]->(handle_create)
-                CREATE (user_controller)-[:HAS_METHOD]->(handle_get)
-            """)
-            logger.info("Created code nodes")
-            
-            # Create relationships between code elements
-            session.run("""
-                MATCH (us:CLASS {name: 'UserService'})
-                MATCH (uc:CLASS {name: 'User'})
-                MATCH (ctrl:CLASS {name: 'UserController'})
-                MATCH (auth:CLASS {name: 'AuthService'})
-                
-                // UserService uses User model
-                CREATE (us)-[:USES]->(uc)
-                
-                // UserController uses UserService
-                CREATE (ctrl)-[:USES]->(us)
-                
-                // AuthService uses UserService
-                CREATE (auth)-[:USES]->(us)
-                
-                // Method calls
-                MATCH (create:FUNCTION {name: 'create_user'})
-                MATCH (validate:FUNCTION {name: 'validate'})
-                CREATE (create)-[:CALLS]->(validate)
-                
-                MATCH (login:FUNCTION {name: 'login'})
-                MATCH (get:FUNCTION {name: 'get_user'})
-                CREATE (login)-[:CALLS]->(get)
-                
-                MATCH (handle:FUNCTION {name: 'handle_create'})
-                CREATE (handle)-[:CALLS]->(create)
-            """)
-            logger.info("Created code relationships")
-            
-            # Create import relationships
-            session.run("""
-                MATCH (usf:FILE {name: 'user_service.py'})
-                MATCH (umf:FILE {name: 'user.py'})
-                CREATE (usf)-[:IMPORTS]->(umf)
-                
-                MATCH (asf:FILE {name: 'auth_service.py'})
-                CREATE (asf)-[:IMPORTS]->(usf)
-                
-                MATCH (ucf:FILE {name: 'user_controller.py'})
-                CREATE (ucf)-[:IMPORTS]->(usf)
-            """)
-            logger.info("Created import relationships")
-            
-            # Create LLM description nodes
-            session.run("""
-                MATCH (us:CLASS {name: 'UserService'})
-                CREATE (us_desc:DESCRIPTION {
-                    description: 'Core service for user management operations. Handles CRUD operations for users with validation and security checks.',
-                    node_id: id(us)
-                })
-                CREATE (us_desc)-[:DESCRIBES]->(us)
-                
-                MATCH (auth:CLASS {name: 'AuthService'})
-                CREATE (auth_desc:DESCRIPTION {
-                    description: 'Authentication service handling user login, token generation, and session management.',
-                    node_id: id(auth)
-                })
-                CREATE (auth_desc)-[:DESCRIBES]->(auth)
-            """)
-            logger.info("Created LLM descriptions")
-            
-            # Create documentation nodes
-            session.run("""
-                CREATE (readme:DOCUMENTATION_FILE {
-                    path: 'file:///project/README.md',
-                    name: 'README.md',
-                    doc_type: 'md'
-                })
-                CREATE (api_doc:DOCUMENTATION_FILE {
-                    path: 'file:///project/docs/api.md',
-                    name: 'api.md',
-                    doc_type: 'md'
-                })
-                
-                // Documentation concepts
-                CREATE (auth_concept:CONCEPT {
-                    name: 'JWT Authentication',
-                    description: 'JSON Web Token based authentication system'
-                })
-                CREATE (rest_concept:CONCEPT {
-                    name: 'REST API',
-                    description: 'RESTful API design patterns'
-                })
-                
-                CREATE (readme)-[:CONTAINS_CONCEPT]->(auth_concept)
-                CREATE (api_doc)-[:CONTAINS_CONCEPT]->(rest_concept)
-                
-                // Link documentation to code
-                MATCH (auth:CLASS {name: 'AuthService'})
-                CREATE (auth_concept)-[:DOCUMENTS]->(auth)
-                
-                MATCH (ctrl:CLASS {name: 'UserController'})
-                CREATE (rest_concept)-[:DOCUMENTS]->(ctrl)
-            """)
-            logger.info("Created documentation nodes")
-            
-            # Create filesystem nodes
-            session.run("""
-                CREATE (fs_src:FILESYSTEM_DIRECTORY {
-                    path: '/project/src',
-                    name: 'src',
-                    size: 4096
-                })
-                CREATE (fs_services:FILESYSTEM_DIRECTORY {
-                    path: '/project/src/services',
-                    name: 'services',
-                    size: 4096
-                })
-                CREATE (fs_user_service:FILESYSTEM_FILE {
-                    path: '/project/src/services/user_service.py',
-                    name: 'user_service.py',
-                    size: 2048,
-                    extension: 'py'
-                })
-                
-                CREATE (fs_src)-[:HAS_CHILD]->(fs_services)
-                CREATE (fs_services)-[:HAS_CHILD]->(fs_user_service)
-                
-                // Link filesystem to code
-                MATCH (usf:FILE {name: 'user_service.py'})
-                CREATE (fs_user_service)-[:REPRESENTS]->(usf)
-            """)
-            logger.info("Created filesystem nodes")
-            
-            # Create test files
-            session.run("""
-                CREATE (test_file:FILE {
-                    path: 'file:///project/tests/test_user_service.py',
-                    name: 'test_user_service.py',
-                    extension: '.py'
-                })
-                
-                MATCH (us:CLASS {name: 'UserService'})
-                CREATE (test_file)-[:TESTS]->(us)
-            """)
-            logger.info("Created test relationships")
-            
-            # Add file relationships to folders
-            session.run("""
-                MATCH (models:FOLDER {name: 'models'})
-                MATCH (umf:FILE {name: 'user.py'})
-                CREATE (models)-[:CONTAINS]->(umf)
-                
-                MATCH (services:FOLDER {name: 'services'})
-                MATCH (usf:FILE {name: 'user_service.py'})
-                MATCH (asf:FILE {name: 'auth_service.py'})
-                CREATE (services)-[:CONTAINS]->(usf)
-                CREATE (services)-[:CONTAINS]->(asf)
-                
-                MATCH (controllers:FOLDER {name: 'controllers'})
-                MATCH (ucf:FILE {name: 'user_controller.py'})
-                CREATE (controllers)-[:CONTAINS]->(ucf)
-                
-                MATCH (tests:FOLDER {name: 'tests'})
-                MATCH (tf:FILE {name: 'test_user_service.py'})
-                CREATE (tests)-[:CONTAINS]->(tf)
-                
-                MATCH (docs:FOLDER {name: 'docs'})
-                MATCH (readme:DOCUMENTATION_FILE {name: 'README.md'})
-                MATCH (api:DOCUMENTATION_FILE {name: 'api.md'})
-                CREATE (docs)-[:CONTAINS]->(readme)
-                CREATE (docs)-[:CONTAINS]->(api)
-            """)
-            logger.info("Created folder relationships")
+            # Schema changes cannot share a transaction with data writes
+            session.run(
+                f"CREATE INDEX {_SETUP_INDEX} IF NOT EXISTS "
+                f"FOR (n:{_SETUP_LABEL}) ON (n.{_SETUP_KEY})"
+            ).consume()
+            try:
+                session.execute_write(self._write_graph, nodes_by_labels, relationships_by_type)
+            finally:
+                # The index only serves the relationship lookups above; leave no trace in the test database
+                session.run(f"DROP INDEX {_SETUP_INDEX} IF EXISTS").consume()
+        
+        logger.info(f"Created test graph with {len(_NODES)} nodes and {len(_RELATIONSHIPS)} relationships")
+    
+    @staticmethod
+    def _write_graph(tx, nodes_by_labels, relationships_by_type):
+        """Write all test nodes and relationships in a single transaction."""
+        # Labels and relationship types cannot be parameters, so batch per label set/type
+        for labels, rows in nodes_by_labels.items():
+            tx.run(
+                f"UNWIND $rows AS row "
+                f"CREATE (n:{labels}:{_SETUP_LABEL}) "
+                f"SET n = row.props, n.{_SETUP_KEY} = row.key",
+                rows=rows
+            )
+        
+        for rel_type, rows in relationships_by_type.items():
+            tx.run(
+                f"UNWIND $rows AS row "
+                f"MATCH (a:{_SETUP_LABEL} {{{_SETUP_KEY}: row.source}}) "
+                f"MATCH (b:{_SETUP_LABEL} {{{_SETUP_KEY}: row.target}}) "
+                f"CREATE (a)-[:{rel_type}]->(b)",
+                rows=rows
+            )
+        
+        tx.run("MATCH (d:DESCRIPTION)-[:DESCRIBES]->(target) SET d.node_id = id(target)")
+        tx.run(f"MATCH (n:{_SETUP_LABEL}) REMOVE n:{_SETUP_LABEL}, n.{_SETUP_KEY}")
     
     def verify_graph(self):
         """Verify the graph was created correctly."""
@@ -377,14 +250,29 @@ class TestGraphSetup:
                 print(f"  Used by: {record['used_by']}")
 
 
+def _wait_for_neo4j(driver, timeout=30):
+    """Poll Neo4j with exponential backoff until it accepts connections."""
+    start = time.monotonic()
+    delay = 0.1
+    while True:
+        try:
+            driver.verify_connectivity()
+            return
+        except ServiceUnavailable:
+            if time.monotonic() - start + delay > timeout:
+                raise
+            time.sleep(delay)
+            delay = min(delay * 2, 2.0)
+
+
 def main():
     """Set up the test graph."""
-    # Wait for Neo4j to be ready
-    print("Waiting for Neo4j to start...")
-    time.sleep(5)
-    
     setup = TestGraphSetup()
     try:
+        # Wait for Neo4j to be ready
+        print("Waiting for Neo4j to start...")
+        _wait_for_neo4j(setup.driver)
+        
         setup.clear_database()
         setup.create_test_graph()
         setup.verify_graph()
@@ -43,6 +43,21 @@ class TestContextBuilder:
         assert "os" in result
         assert "sys" in result
     
+    def test_build_files_context_groups_by_directory(self, context_builder):
+        """Test that files are grouped under one header per directory."""
+        file_contexts = [
+            {"file": {"path": "/src/b/one.py"}},
+            {"file": {"path": "/src/a/two.py"}},
+            {"file": {"path": "/src/b/three.py"}},
+            {"file": {"path": "root.py"}},
+        ]
+        
+        result = context_builder.build_files_context(file_contexts)
+        assert result.count("## Directory: /src/b") == 1
+        assert result.index("## Directory: /src/a") < result.index("## Directory: /src/b")
+        assert result.index("File: one.py") < result.index("File: three.py")
+        assert "File: root.py" in result
+    
     def test_build_symbol_context(self, context_builder):
         """Test building context for a symbol."""
         symbol_context = {
@@ -70,6 +85,30 @@ class TestContextBuilder:
         assert "create_user" in result
         assert "get_user" in result
         assert "Called by**: 1 locations" in result
+        assert "Related Symbols" not in result
+    
+    def test_build_symbol_context_with_related(self, context_builder):
+        """Test building symbol context with related symbols."""
+        symbol_context = {"symbol": {"name": "UserService", "_labels": ["CLASS"]}}
+        related = [{"symbol": {"name": "BaseService", "_labels": ["CLASS"]}}]
+        
+        result = context_builder.build_symbol_context(symbol_context, related)
+        assert result.startswith("# Symbol: UserService")
+        assert "Related Symbols" in result
+        assert "### BaseService" in result
+    
+    def test_build_symbol_context_truncates_long_lists(self, context_builder):
+        """Test that long subclass and method lists end with an "... and N more" note."""
+        symbol_context = {
+            "symbol": {"name": "BaseService", "_labels": ["CLASS"]},
+            "children": [{"name": f"Service{i}"} for i in range(7)],
+            "methods": [{"name": f"method_{i}"} for i in range(12)]
+        }
+        
+        result = context_builder.build_symbol_context(symbol_context)
+        assert "Service4 ... and 2 more\n" in result
+        assert "Service5" not in result
+        assert "- ... and 2 more\n" in result
     
     def test_build_change_plan_context(self, context_builder):
         """Test building context for change planning."""
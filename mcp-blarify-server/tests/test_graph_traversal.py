@@ -0,0 +1,137 @@
+"""Tests for graph traversal."""
+
+import pytest
+from unittest.mock import MagicMock
+from src.processors.graph_traversal import GraphTraversal, _SYMBOL_LIST_KEYS, _SYMBOL_SCALAR_KEYS
+
+
+class StubNode(dict):
+    """Minimal stand-in for a neo4j Node: a property mapping with labels and an id."""
+    
+    def __init__(self, node_id, labels, **properties):
+        super().__init__(properties)
+        self.id = node_id
+        self.labels = frozenset(labels)
+
+
+class StubRecord(dict):
+    """Mapping standing in for a neo4j Record."""
+
+
+def make_traversal(records):
+    """Build a GraphTraversal whose session.run returns the given records."""
+    result = MagicMock()
+    result.__iter__.side_effect = lambda: iter(records)
+    result.single.return_value = records[0] if records else None
+    session = MagicMock()
+    session.run.return_value = result
+    driver = MagicMock()
+    driver.session.return_value.__enter__.return_value = session
+    traversal = GraphTraversal(driver)
+    traversal.query_builder = MagicMock()
+    return traversal
+
+
+class TestGraphTraversal:
+    """Test graph traversal functionality."""
+    
+    @pytest.fixture
+    def traversal(self):
+        """Traversal with no records."""
+        return make_traversal([])
+    
+    def test_projection_keeps_whitelisted_properties(self, traversal):
+        """Test that known label sets only keep projected properties."""
+        node = StubNode(1, ["FILE", "NODE"], path="src/main.py", name="main.py",
+                        text="print('hello')" * 100, hashed_id="abc")
+        result = traversal._node_to_dict(node)
+        
+        assert result == {
+            "path": "src/main.py",
+            "name": "main.py",
+            "_id": 1,
+            "_labels": list(node.labels)
+        }
+    
+    def test_projection_skips_missing_properties(self, traversal):
+        """Test that absent whitelisted properties are not added as None."""
+        node = StubNode(2, ["FUNCTION"], name="main", text="def main(): pass")
+        result = traversal._node_to_dict(node)
+        
+        assert "text" not in result
+        assert "start_line" not in result
+        assert result["name"] == "main"
+    
+    def test_unknown_label_set_keeps_every_property(self, traversal):
+        """Test that label sets without a projection pass through in full."""
+        node = StubNode(3, ["DOCUMENTATION_FILE"], path="README.md", content="# Readme", extra=1)
+        result = traversal._node_to_dict(node)
+        
+        assert result["content"] == "# Readme"
+        assert result["extra"] == 1
+        assert result["path"] == "README.md"
+        assert result["_labels"] == ["DOCUMENTATION_FILE"]
+    
+    def test_empty_node_is_none(self, traversal):
+        """Test that missing nodes convert to None."""
+        assert traversal._node_to_dict(None) is None
+    
+    def test_labels_are_not_shared_between_results(self, traversal):
+        """Test that mutating one result's labels does not leak into another."""
+        first = traversal._node_to_dict(StubNode(1, ["CLASS"], name="A"))
+        second = traversal._node_to_dict(StubNode(2, ["CLASS"], name="B"))
+        
+        first["_labels"].append("MUTATED")
+        third = traversal._node_to_dict(StubNode(3, ["CLASS"], name="C"))
+        
+        assert second["_labels"] == ["CLASS"]
+        assert third["_labels"] == ["CLASS"]
+    
+    def test_labels_cache_is_keyed_by_label_set(self, traversal):
+        """Test that label sets are cached once regardless of label order."""
+        traversal._node_to_dict(StubNode(1, ["METHOD", "FUNCTION"], name="a"))
+        traversal._node_to_dict(StubNode(2, ["FUNCTION", "METHOD"], name="b"))
+        traversal._node_to_dict(StubNode(3, ["CLASS"], name="C"))
+        
+        assert set(traversal._labels_cache) == {
+            frozenset(["METHOD", "FUNCTION"]),
+            frozenset(["CLASS"])
+        }
+    
+    def test_get_symbol_context_fills_every_key(self):
+        """Test that symbol context converts list and scalar fields."""
+        record = StubRecord({key: [] for key in _SYMBOL_LIST_KEYS})
+        record.update({key: None for key in _SYMBOL_SCALAR_KEYS})
+        record["symbol"] = StubNode(1, ["CLASS"], name="UserService")
+        record["methods"] = [StubNode(2, ["METHOD", "FUNCTION"], name="get_user"), None]
+        record["file"] = StubNode(3, ["FILE"], path="src/user.py")
+        
+        context = make_traversal([record]).get_symbol_context(1)
+        
+        assert set(context) == {"symbol", *_SYMBOL_LIST_KEYS, *_SYMBOL_SCALAR_KEYS}
+        assert context["symbol"]["name"] == "UserService"
+        assert [m["name"] for m in context["methods"]] == ["get_user"]
+        assert context["callers"] == []
+        assert context["file"]["path"] == "src/user.py"
+        assert context["description"] is None
+    
+    def test_get_symbol_context_missing_record(self):
+        """Test that an unknown symbol returns an empty context."""
+        assert make_traversal([]).get_symbol_context(1) == {}
+    
+    def test_analyze_change_impact_keys_by_target(self):
+        """Test that impact results are keyed by target name, falling back to path."""
+        empty = {"dependents": [], "containing_files": [], "test_files": [], "documentation": []}
+        records = [
+            StubRecord(empty, target=StubNode(1, ["CLASS"], name="UserService"),
+                       dependents=[StubNode(2, ["FUNCTION"], name="login"), None]),
+            StubRecord(empty, target=StubNode(3, ["FILE"], path="src/user.py")),
+            StubRecord(empty, target=StubNode(4, ["CONCEPT"], description="Caching"))
+        ]
+        
+        impact = make_traversal(records).analyze_change_impact(["UserService"])
+        
+        assert list(impact) == ["UserService", "src/user.py", "unknown"]
+        assert [d["name"] for d in impact["UserService"]["dependents"]] == ["login"]
+        assert impact["src/user.py"]["target"]["path"] == "src/user.py"
+        assert impact["unknown"]["test_files"] == []
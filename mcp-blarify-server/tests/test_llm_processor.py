@@ -1,7 +1,13 @@
 """Tests for LLM processor."""
 
+import asyncio
+import json
+import threading
 import pytest
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
+from openai import InternalServerError, RateLimitError
+from src.config import Config
+from src.processors import llm_processor
 from src.processors.llm_processor import LLMProcessor
 
 
@@ -25,6 +31,19 @@ class TestLLMProcessor:
             with patch('src.processors.llm_processor.AzureOpenAI'):
                 return LLMProcessor()
     
+    @pytest.fixture
+    def llm_processor_mocked(self):
+        """Create an enabled LLM processor whose Azure clients are mocks."""
+        with patch.object(Config, 'AZURE_OPENAI_API_KEY', 'test-key'), \
+                patch.object(Config, 'LLM_CACHE_DIR', None), \
+                patch('src.processors.llm_processor.AzureOpenAI'), \
+                patch('src.processors.llm_processor.AsyncAzureOpenAI'):
+            llm_processor._get_azure_client.cache_clear()
+            llm_processor._async_clients.clear()
+            yield LLMProcessor()
+        llm_processor._get_azure_client.cache_clear()
+        llm_processor._async_clients.clear()
+    
     def test_llm_disabled(self, llm_processor_disabled):
         """Test LLM processor when disabled."""
         assert not llm_processor_disabled.enabled
@@ -106,4 +125,502 @@ class TestLLMProcessor:
         entities = llm_processor_disabled._extract_entities_basic(change_request)
         
         assert "user_service.py" in entities
-        assert "auth_controller.js" in entities
\ No newline at end of file
+        assert "auth_controller.js" in entities
+    
+    def test_extract_entities_basic_filters_and_caps(self, llm_processor_disabled):
+        """Test that common words are dropped, order is kept and output is capped."""
+        change_request = "Update the UserService and the UserService tests " + " ".join(
+            f"Entity{i}" for i in range(30)
+        )
+        entities = llm_processor_disabled._extract_entities_basic(change_request)
+        
+        assert entities[:3] == ["Update", "UserService", "tests"]
+        assert "the" not in entities
+        assert entities.count("UserService") == 1
+        assert len(entities) == 20
+    
+    def test_extract_entities_basic_uses_re2_for_long_requests(self, llm_processor_disabled):
+        """Test that only long requests are matched with the re2 pattern."""
+        linear = Mock(wraps=llm_processor._ENTITY_RE)
+        short_request = "Update UserService"
+        long_request = short_request + " padding" * 300
+        
+        with patch.object(llm_processor, '_ENTITY_RE2', linear):
+            assert llm_processor_disabled._extract_entities_basic(short_request) == ["Update", "UserService"]
+            assert linear.finditer.call_count == 0
+            assert llm_processor_disabled._extract_entities_basic(long_request)[:2] == ["Update", "UserService"]
+            assert linear.finditer.call_count == 1
+    
+    def test_file_context_prompt_is_compact(self, llm_processor_disabled):
+        """Test that prompt JSON is unindented and long lists are summarized."""
+        context = {
+            "file": {"path": "/src/main.py"},
+            "contents": [{"name": f"func_{i}"} for i in range(60)],
+            "imports": [{"name": "os"}]
+        }
+        prompt = llm_processor_disabled._create_file_context_prompt(context)
+        
+        assert 'Imports: [{"name":"os"}]' in prompt
+        assert '"func_49"' in prompt
+        assert '"func_50"' not in prompt
+        assert "... (10 more omitted)" in prompt
+    
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_prompt_json_matches_with_and_without_orjson(self, use_orjson):
+        """Test that prompt serialization is identical whether or not orjson is installed."""
+        value = [{"name": "café", "line": 3, "tags": ["a", "b"]}]
+        backend = llm_processor.orjson if use_orjson else None
+        if use_orjson and backend is None:
+            pytest.skip("orjson not installed")
+        
+        with patch.object(llm_processor, 'orjson', backend):
+            assert llm_processor._prompt_json(value) == '[{"name":"café","line":3,"tags":["a","b"]}]'
+            assert llm_processor._loads('{"entities": ["User"]}') == {"entities": ["User"]}
+    
+    def test_prompts_start_with_fixed_instructions(self, llm_processor_disabled):
+        """Test that variable context follows the shared instruction prefix."""
+        first = llm_processor_disabled._create_file_context_prompt({"file": {"path": "/src/a.py"}})
+        second = llm_processor_disabled._create_file_context_prompt({"file": {"path": "/src/b.py"}})
+        
+        assert first.startswith(llm_processor._FILE_CONTEXT_INSTRUCTIONS)
+        assert second.startswith(llm_processor._FILE_CONTEXT_INSTRUCTIONS)
+        assert first.index("/src/a.py") > len(llm_processor._FILE_CONTEXT_INSTRUCTIONS)
+    
+    @staticmethod
+    def _stream_chunks(*parts):
+        """Build streamed completion chunks carrying the given content deltas."""
+        return [Mock(choices=[Mock(delta=Mock(content=part))]) for part in parts]
+    
+    def test_organize_file_context_stream(self, llm_processor_mocked):
+        """Test that file context is streamed chunk by chunk."""
+        create = llm_processor_mocked.client.chat.completions.create
+        create.return_value = iter(self._stream_chunks("# Organized", None, " Context"))
+        
+        parts = list(llm_processor_mocked.organize_file_context_stream({"file": {"path": "/src/main.py"}}))
+        
+        assert parts == ["# Organized", " Context"]
+        assert create.call_args.kwargs["stream"] is True
+    
+    def test_organize_file_context_stream_falls_back(self, llm_processor_mocked):
+        """Test that a failed stream yields the rule-based markdown."""
+        llm_processor_mocked.client.chat.completions.create.side_effect = RuntimeError("boom")
+        
+        result = llm_processor_mocked.organize_file_context({"file": {"path": "/src/main.py"}})
+        assert "Context for File: /src/main.py" in result
+    
+    def test_interrupted_stream_falls_back_when_buffered(self, llm_processor_mocked):
+        """Test that a stream failing mid-reply is not returned as a complete answer."""
+        def broken_stream():
+            yield from self._stream_chunks("# Partial")
+            raise RuntimeError("connection reset")
+        
+        create = llm_processor_mocked.client.chat.completions.create
+        create.side_effect = lambda **kwargs: broken_stream()
+        
+        streamed = list(llm_processor_mocked.organize_file_context_stream({"file": {"path": "/src/main.py"}}))
+        plan = llm_processor_mocked.create_implementation_plan("Change", {})
+        
+        assert streamed == ["# Partial", llm_processor._TRUNCATED_MARKER]
+        assert "# Partial" not in plan
+        assert plan == llm_processor_mocked._build_basic_implementation_plan("Change", {})
+    
+    @pytest.mark.asyncio
+    async def test_ainterrupted_stream_falls_back(self, llm_processor_mocked):
+        """Test that the async wrappers also fall back when a stream fails mid-reply."""
+        async def broken_stream():
+            for chunk in self._stream_chunks("# Partial"):
+                yield chunk
+            raise RuntimeError("connection reset")
+        
+        llm_processor_mocked.aclient.chat.completions.create = AsyncMock(side_effect=lambda **kwargs: broken_stream())
+        
+        result = await llm_processor_mocked.aorganize_symbol_context({"symbol": {"name": "User", "_labels": ["CLASS"]}})
+        
+        assert "# Partial" not in result
+        assert result.startswith("# Context for Symbol: User")
+    
+    @pytest.mark.asyncio
+    async def test_ainterrupted_unbuffered_stream_is_marked_truncated(self, llm_processor_mocked):
+        """Test that an async stream failing after output ends with the truncation marker."""
+        async def broken_stream():
+            for chunk in self._stream_chunks("# Partial", " reply"):
+                yield chunk
+            raise RuntimeError("connection reset")
+        
+        llm_processor_mocked.aclient.chat.completions.create = AsyncMock(side_effect=lambda **kwargs: broken_stream())
+        
+        streamed = [part async for part in llm_processor_mocked.aorganize_symbol_context_stream(
+            {"symbol": {"name": "User", "_labels": ["CLASS"]}}
+        )]
+        
+        assert streamed == ["# Partial", " reply", llm_processor._TRUNCATED_MARKER]
+    
+    def test_stream_failing_before_output_falls_back(self, llm_processor_mocked):
+        """Test that an unbuffered stream failing before any output yields only the fallback."""
+        def broken_stream():
+            raise RuntimeError("connection reset")
+            yield
+        
+        streamed = list(llm_processor_mocked._stream_with_fallback(broken_stream(), lambda: "fallback"))
+        
+        assert streamed == ["fallback"]
+    
+    def test_file_context_sections_are_reused(self, llm_processor_mocked):
+        """Test that only sections whose graph data changed are re-rendered."""
+        create = llm_processor_mocked.client.chat.completions.create
+        create.return_value = Mock(choices=[Mock(message=Mock(content="## Section"))])
+        context = {
+            "file": {"path": "/src/main.py"},
+            "contents": [{"name": "main"}],
+            "imports": [{"name": "os"}]
+        }
+        
+        with patch.object(Config, 'LLM_SECTION_CACHE', True):
+            first = llm_processor_mocked.organize_file_context(context)
+            context["imports"] = [{"name": "sys"}]
+            second = llm_processor_mocked.organize_file_context(context)
+        
+        assert first == second == "# Context for File: /src/main.py\n\n" + "## Section\n\n" * 3
+        assert create.call_count == 4
+        assert llm_processor_mocked.stats["section_hits"] == 2
+    
+    @pytest.mark.asyncio
+    async def test_aorganize_file_context_sections(self, llm_processor_mocked):
+        """Test that the async path renders sections concurrently and falls back on failure."""
+        llm_processor_mocked.aclient.chat.completions.create = AsyncMock(
+            return_value=Mock(choices=[Mock(message=Mock(content="## Section"))])
+        )
+        
+        with patch.object(Config, 'LLM_SECTION_CACHE', True):
+            result = await llm_processor_mocked.aorganize_file_context({"file": {"path": "/src/main.py"}})
+            llm_processor_mocked.aclient.chat.completions.create.side_effect = RuntimeError("boom")
+            fallback = await llm_processor_mocked.aorganize_file_context({"file": {"path": "/src/other.py"}})
+        
+        assert result == "# Context for File: /src/main.py\n\n## Section\n\n"
+        assert fallback == "# Context for File: /src/other.py\n\n"
+    
+    def test_organize_files_runs_in_parallel(self, llm_processor_mocked):
+        """Test that organize_files overlaps requests and keeps input order."""
+        llm_processor_mocked.max_concurrency = 4
+        barrier = threading.Barrier(4, timeout=5)
+        
+        def fake_create(**kwargs):
+            barrier.wait()
+            path = kwargs["messages"][1]["content"].split("File: ")[1].split("\n")[0]
+            return iter(self._stream_chunks(path))
+        
+        llm_processor_mocked.client.chat.completions.create.side_effect = fake_create
+        paths = [f"/src/file_{i}.py" for i in range(4)]
+        
+        results = llm_processor_mocked.organize_files([{"file": {"path": path}} for path in paths])
+        
+        assert results == paths
+    
+    def test_organize_symbols_without_llm(self, llm_processor_disabled):
+        """Test that organize_symbols falls back to rule-based markdown per symbol."""
+        results = llm_processor_disabled.organize_symbols([
+            {"symbol": {"name": "User", "_labels": ["CLASS"]}},
+            {"symbol": {"name": "login", "_labels": ["FUNCTION"]}}
+        ])
+        
+        assert [result.splitlines()[0] for result in results] == [
+            "# Context for Symbol: User",
+            "# Context for Symbol: login"
+        ]
+    
+    @pytest.mark.asyncio
+    async def test_aorganize_file_context_with_llm(self, llm_processor_mocked):
+        """Test organizing file context through the async client."""
+        chunks = self._stream_chunks("# Organized", " Context")
+        
+        async def fake_stream():
+            for chunk in chunks:
+                yield chunk
+        
+        llm_processor_mocked.aclient.chat.completions.create = AsyncMock(return_value=fake_stream())
+        
+        result = await llm_processor_mocked.aorganize_file_context({"file": {"path": "/src/main.py"}})
+        assert result == "# Organized Context"
+    
+    @pytest.mark.asyncio
+    async def test_achat_respects_max_concurrency(self, llm_processor_mocked):
+        """Test that concurrent async requests are capped by max_concurrency."""
+        llm_processor_mocked.max_concurrency = 2
+        in_flight = 0
+        peak = 0
+        
+        async def fake_create(**kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return Mock(choices=[Mock(message=Mock(content="ok"))])
+        
+        llm_processor_mocked.aclient.chat.completions.create = fake_create
+        
+        results = await asyncio.gather(
+            *(llm_processor_mocked._achat("system", "user", 0.1, 10) for _ in range(5))
+        )
+        assert results == ["ok"] * 5
+        assert peak == 2
+    
+    @pytest.mark.asyncio
+    async def test_aorganize_files_keeps_order_under_cap(self, llm_processor_mocked):
+        """Test that aorganize_files overlaps requests up to the cap and keeps input order."""
+        llm_processor_mocked.max_concurrency = 3
+        in_flight = 0
+        peak = 0
+        
+        async def fake_create(**kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            path = kwargs["messages"][1]["content"].split("File: ")[1].split("\n")[0]
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            
+            async def stream():
+                for chunk in self._stream_chunks(path):
+                    yield chunk
+            return stream()
+        
+        llm_processor_mocked.aclient.chat.completions.create = fake_create
+        paths = [f"/src/file_{i}.py" for i in range(6)]
+        
+        results = await llm_processor_mocked.aorganize_files([{"file": {"path": path}} for path in paths])
+        
+        assert results == paths
+        assert peak == 3
+    
+    @pytest.mark.asyncio
+    async def test_abatch_implementation_plans_uses_batch_api(self, llm_processor_mocked):
+        """Test that large planning runs go through one Batch API job and resume from the cache."""
+        llm_processor_mocked.batch_deployment_name = "test-batch"
+        requests = [(f"Change {i}", {}) for i in range(3)]
+        submitted = {}
+        
+        async def fake_files_create(file, purpose):
+            lines = [json.loads(line) for line in file[1].decode("utf-8").splitlines()]
+            submitted.update((line["custom_id"], line["body"]["model"]) for line in lines)
+            return Mock(id="file-in")
+        
+        async def fake_files_content(file_id):
+            # The last request failed inside the batch and is planned directly instead
+            keys = list(submitted)
+            results = [
+                {"custom_id": key, "response": {"status_code": 200, "body": {
+                    "choices": [{"message": {"content": f" Plan {i} "}}]
+                }}}
+                for i, key in enumerate(keys[:2])
+            ]
+            results.append({"custom_id": keys[2], "response": {"status_code": 500}})
+            return Mock(text="\n".join(json.dumps(result) for result in results))
+        
+        aclient = llm_processor_mocked.aclient
+        aclient.files.create = fake_files_create
+        aclient.files.content = fake_files_content
+        aclient.batches.create = AsyncMock(return_value=Mock(id="batch-1", status="in_progress"))
+        aclient.batches.retrieve = AsyncMock(return_value=Mock(id="batch-1", status="completed", output_file_id="file-out"))
+        
+        with patch.object(Config, 'LLM_BATCH_MIN_REQUESTS', 2), \
+                patch.object(llm_processor.asyncio, 'sleep', AsyncMock()), \
+                patch.object(llm_processor_mocked, 'acreate_implementation_plan', AsyncMock(return_value="Direct plan")) as direct:
+            plans = await llm_processor_mocked.abatch_implementation_plans(requests)
+            
+            assert plans[:2] == ["Plan 0", "Plan 1"]
+            assert set(submitted.values()) == {"test-batch"}
+            assert plans[2] == "Direct plan"
+            direct.assert_awaited_once_with("Change 2", {})
+            assert aclient.batches.create.call_args.kwargs["endpoint"] == "/chat/completions"
+            assert aclient.batches.retrieve.await_count == 1
+            
+            # A rerun only submits the request without a cached plan
+            submitted.clear()
+            await llm_processor_mocked.abatch_implementation_plans(requests)
+            assert len(submitted) == 1
+    
+    @pytest.mark.asyncio
+    async def test_abatch_implementation_plans_small_runs_stay_interactive(self, llm_processor_mocked):
+        """Test that runs below the batch threshold call the LLM directly."""
+        llm_processor_mocked.batch_deployment_name = "test-batch"
+        llm_processor_mocked.aclient.files.create = AsyncMock()
+        
+        with patch.object(llm_processor_mocked, 'acreate_implementation_plan', AsyncMock(return_value="Plan")):
+            plans = await llm_processor_mocked.abatch_implementation_plans([("Change", {})])
+        
+        assert plans == ["Plan"]
+        llm_processor_mocked.aclient.files.create.assert_not_called()
+    
+    def test_low_temperature_responses_are_cached(self, llm_processor_mocked):
+        """Test that repeated entity extraction is served from the response cache."""
+        mock_response = Mock()
+        mock_response.choices = [Mock(message=Mock(content='{"entities": ["UserService"]}'))]
+        create = llm_processor_mocked.client.chat.completions.create
+        create.return_value = mock_response
+        
+        first = llm_processor_mocked.extract_entities_from_request("Update UserService")
+        second = llm_processor_mocked.extract_entities_from_request("Update UserService")
+        
+        assert first == second == ["UserService"]
+        assert create.call_count == 1
+        assert create.call_args.kwargs["response_format"] == {"type": "json_object"}
+        assert llm_processor_mocked.stats["cache_hits"] == 1
+        assert llm_processor_mocked.stats["cache_misses"] == 1
+    
+    def test_high_temperature_responses_are_not_cached(self, llm_processor_mocked):
+        """Test that creative requests bypass the cache unless ENABLE_LLM_CACHE is set."""
+        mock_response = Mock()
+        mock_response.choices = [Mock(message=Mock(content="# Plan"))]
+        create = llm_processor_mocked.client.chat.completions.create
+        create.return_value = mock_response
+        
+        llm_processor_mocked.create_implementation_plan("Add caching", {})
+        llm_processor_mocked.create_implementation_plan("Add caching", {})
+        
+        assert create.call_count == 2
+    
+    def test_semantic_cache_reuses_paraphrased_extraction(self, llm_processor_mocked):
+        """Test that a paraphrased request is answered from the semantic cache."""
+        llm_processor_mocked.embedding_deployment = "text-embedding-3-small"
+        llm_processor_mocked.client.embeddings.create.side_effect = [
+            Mock(data=[Mock(embedding=[1.0, 0.0, 0.1])]),
+            Mock(data=[Mock(embedding=[0.99, 0.01, 0.1])])
+        ]
+        create = llm_processor_mocked.client.chat.completions.create
+        create.return_value = Mock(choices=[Mock(message=Mock(content='{"entities": ["UserService"]}'))])
+        
+        first = llm_processor_mocked.extract_entities_from_request("Refactor UserService")
+        second = llm_processor_mocked.extract_entities_from_request("Rewrite the UserService class")
+        
+        assert first == second == ["UserService"]
+        assert create.call_count == 1
+        assert llm_processor_mocked.stats["semantic_hits"] == 1
+    
+    def test_chat_retries_rate_limits(self, llm_processor_mocked):
+        """Test that rate-limited requests are retried after the Retry-After delay."""
+        rate_limited = RateLimitError("slow down", response=Mock(headers={"retry-after": "2"}), body=None)
+        create = llm_processor_mocked.client.chat.completions.create
+        create.side_effect = [rate_limited, Mock(choices=[Mock(message=Mock(content="ok"))])]
+        
+        with patch.object(llm_processor.time, 'sleep') as sleep:
+            result = llm_processor_mocked._chat("system", "user", temperature=0.5, max_tokens=10)
+        
+        assert result == "ok"
+        assert create.call_count == 2
+        sleep.assert_called_once_with(2.0)
+    
+    @pytest.mark.parametrize("retry_after, expected", [
+        ("86400", llm_processor._RETRY_MAX_DELAY),
+        ("-5", 0.0),
+        ("inf", llm_processor._RETRY_MAX_DELAY)
+    ])
+    def test_retry_after_is_clamped(self, retry_after, expected):
+        """Test that oversized and negative Retry-After values are clamped."""
+        error = RateLimitError("slow down", response=Mock(headers={"retry-after": retry_after}), body=None)
+        assert llm_processor._retry_delay(error, 0) == expected
+    
+    def test_unparseable_retry_after_uses_backoff(self):
+        """Test that a NaN Retry-After falls back to exponential backoff."""
+        error = RateLimitError("slow down", response=Mock(headers={"retry-after": "nan"}), body=None)
+        delay = llm_processor._retry_delay(error, 1)
+        assert 2 * llm_processor._RETRY_BASE_DELAY <= delay <= 3 * llm_processor._RETRY_BASE_DELAY
+    
+    def test_chat_gives_up_after_retries(self, llm_processor_mocked):
+        """Test that persistent failures surface after the last attempt and other errors are not retried."""
+        create = llm_processor_mocked.client.chat.completions.create
+        create.side_effect = RateLimitError("slow down", response=Mock(headers={}), body=None)
+        
+        with patch.object(llm_processor.time, 'sleep') as sleep:
+            with pytest.raises(RateLimitError):
+                llm_processor_mocked._chat("system", "user", temperature=0.5, max_tokens=10)
+            assert create.call_count == 3
+            assert sleep.call_count == 2
+            
+            create.reset_mock()
+            create.side_effect = ValueError("bad request")
+            with pytest.raises(ValueError):
+                llm_processor_mocked._chat("system", "user", temperature=0.5, max_tokens=10)
+            assert create.call_count == 1
+    
+    @pytest.mark.asyncio
+    async def test_achat_retries_server_errors(self, llm_processor_mocked):
+        """Test that the async client retries transient server errors."""
+        server_error = InternalServerError("unavailable", response=Mock(headers={}), body=None)
+        llm_processor_mocked.aclient.chat.completions.create = AsyncMock(
+            side_effect=[server_error, Mock(choices=[Mock(message=Mock(content="ok"))])]
+        )
+        
+        with patch.object(llm_processor.asyncio, 'sleep', AsyncMock()) as sleep:
+            result = await llm_processor_mocked._achat("system", "user", temperature=0.5, max_tokens=10)
+        
+        assert result == "ok"
+        assert sleep.await_count == 1
+    
+    def test_entity_extraction_uses_small_deployment(self, llm_processor_mocked):
+        """Test that entity extraction runs on the small deployment with a tight budget."""
+        llm_processor_mocked.small_deployment_name = "gpt-4o-mini"
+        create = llm_processor_mocked.client.chat.completions.create
+        create.return_value = Mock(choices=[Mock(message=Mock(content='{"entities": []}'))])
+        
+        llm_processor_mocked.extract_entities_from_request("Update UserService")
+        
+        assert create.call_args.kwargs["model"] == "gpt-4o-mini"
+        assert create.call_args.kwargs["max_tokens"] == 150
+    
+    def test_organize_context_deployment_override(self, llm_processor_mocked):
+        """Test that organize methods can target another deployment."""
+        create = llm_processor_mocked.client.chat.completions.create
+        create.return_value = iter(self._stream_chunks("# Symbol"))
+        
+        llm_processor_mocked.organize_symbol_context({"symbol": {"name": "User"}}, deployment="gpt-4o")
+        
+        assert create.call_args.kwargs["model"] == "gpt-4o"
+    
+    def test_extract_entities_from_requests_batches(self, llm_processor_mocked):
+        """Test that several change requests are extracted in one call."""
+        create = llm_processor_mocked.client.chat.completions.create
+        create.return_value = Mock(choices=[Mock(message=Mock(
+            content='{"0": ["UserService"], "1": ["AuthController", "login"]}'
+        ))])
+        
+        results = llm_processor_mocked.extract_entities_from_requests([
+            "Update UserService",
+            "Fix login in AuthController"
+        ])
+        
+        assert results == [["UserService"], ["AuthController", "login"]]
+        assert create.call_count == 1
+        assert create.call_args.kwargs["response_format"] == {"type": "json_object"}
+    
+    def test_extract_entities_from_requests_without_llm(self, llm_processor_disabled):
+        """Test batch extraction falls back to basic extraction when disabled."""
+        results = llm_processor_disabled.extract_entities_from_requests(["Update UserService"])
+        assert len(results) == 1
+        assert "UserService" in results[0]
+    
+    def test_processors_share_azure_clients(self, llm_processor_mocked):
+        """Test that processors with the same credentials reuse one client."""
+        with patch.object(Config, 'AZURE_OPENAI_API_KEY', 'test-key'), \
+                patch.object(Config, 'LLM_CACHE_DIR', None):
+            other = LLMProcessor()
+        
+        assert other.client is llm_processor_mocked.client
+        assert other.aclient is llm_processor_mocked.aclient
+    
+    def test_async_client_is_per_event_loop(self, llm_processor_mocked):
+        """Test that each event loop gets its own async client, reused within the loop."""
+        async def clients():
+            return llm_processor_mocked.aclient, llm_processor_mocked.aclient
+        
+        with patch('src.processors.llm_processor.AsyncAzureOpenAI', side_effect=lambda **kwargs: Mock()):
+            first, again = asyncio.run(clients())
+            second, _ = asyncio.run(clients())
+        
+        assert first is again
+        assert second is not first
+    
+    def test_get_llm_processor_is_singleton(self):
+        """Test that the module-level accessor returns one shared processor."""
+        with patch.object(llm_processor, '_llm_processor', None):
+            assert llm_processor.get_llm_processor() is llm_processor.get_llm_processor()
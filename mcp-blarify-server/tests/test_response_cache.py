@@ -0,0 +1,137 @@
+"""Tests for the LLM response cache."""
+
+import json
+import pytest
+from unittest.mock import Mock, patch
+from src.processors import response_cache
+from src.processors.response_cache import ResponseCache, SemanticCache
+
+
+class TestResponseCache:
+    """Test response cache functionality."""
+    
+    @pytest.fixture
+    def request_args(self):
+        """Sample chat completion request."""
+        return {
+            "model": "gpt-4",
+            "messages": [
+                {"role": "system", "content": "You are a code parser."},
+                {"role": "user", "content": "Update UserService"}
+            ],
+            "temperature": 0.1,
+            "max_tokens": 500
+        }
+    
+    def test_make_key_is_stable(self, request_args):
+        """Test that identical requests hash to the same key."""
+        key = ResponseCache.make_key(request_args)
+        assert key == ResponseCache.make_key(dict(reversed(list(request_args.items()))))
+        assert key != ResponseCache.make_key({**request_args, "temperature": 0.3})
+        assert key != ResponseCache.make_key({**request_args, "model": "gpt-4o-mini"})
+    
+    def test_get_set_in_memory(self):
+        """Test storing and retrieving without a disk backend."""
+        cache = ResponseCache()
+        assert cache.get("key") is None
+        
+        cache.set("key", "value")
+        assert cache.get("key") == "value"
+    
+    def test_expired_entries_are_ignored(self):
+        """Test that entries past their TTL are treated as misses."""
+        cache = ResponseCache(ttl_seconds=10)
+        with patch("src.processors.response_cache.time.time", return_value=1000.0):
+            cache.set("key", "value")
+        with patch("src.processors.response_cache.time.time", return_value=1011.0):
+            assert cache.get("key") is None
+    
+    def test_memory_lru_eviction(self):
+        """Test that the in-memory front evicts least recently used entries."""
+        cache = ResponseCache(max_memory_entries=2)
+        cache.set("a", "1")
+        cache.set("b", "2")
+        cache.get("a")
+        cache.set("c", "3")
+        
+        assert cache.get("a") == "1"
+        assert cache.get("b") is None
+        assert cache.get("c") == "3"
+    
+    def test_disk_backend_persists_across_instances(self, tmp_path):
+        """Test that entries written by one cache are visible to another."""
+        ResponseCache(cache_dir=str(tmp_path)).set("key", "value")
+        
+        assert ResponseCache(cache_dir=str(tmp_path)).get("key") == "value"
+    
+    def test_expired_disk_entries_are_deleted(self, tmp_path):
+        """Test that reading an expired entry removes its file."""
+        cache = ResponseCache(cache_dir=str(tmp_path), ttl_seconds=10)
+        with patch("src.processors.response_cache.time.time", return_value=1000.0):
+            cache.set("key", "value")
+        with patch("src.processors.response_cache.time.time", return_value=1011.0):
+            assert ResponseCache(cache_dir=str(tmp_path)).get("key") is None
+        
+        assert not list(tmp_path.iterdir())
+    
+    def test_redis_backend_shares_entries(self, tmp_path):
+        """Test that a Redis URL takes precedence over the disk backend and sets a TTL."""
+        store = {}
+        client = Mock()
+        client.get.side_effect = store.get
+        client.set.side_effect = lambda key, value, ex: store.__setitem__(key, value)
+        fake_redis = Mock(RedisError=ConnectionError)
+        fake_redis.Redis.from_url.return_value = client
+        
+        with patch("src.processors.response_cache.redis", fake_redis):
+            ResponseCache(cache_dir=str(tmp_path), ttl_seconds=60, redis_url="redis://cache").set("key", "value")
+            other = ResponseCache(redis_url="redis://cache", namespace="llm")
+            
+            assert other.get("key") == "value"
+            assert list(store) == ["cue:llm:key"]
+            assert client.set.call_args.kwargs["ex"] == 60
+            assert not list(tmp_path.iterdir())
+            
+            client.get.side_effect = ConnectionError("down")
+            assert ResponseCache(redis_url="redis://cache").get("missing") is None
+    
+    def test_semantic_cache_matches_similar_requests(self):
+        """Test that requests with nearby embeddings share cached entities."""
+        cache = SemanticCache(threshold=0.9)
+        cache.add("Refactor UserService", [1.0, 0.0, 0.1], ["UserService"])
+        
+        assert cache.lookup("Rewrite the UserService class", [0.99, 0.01, 0.1]) == ["UserService"]
+        assert cache.lookup("Refactor UserService", [0.0, 1.0, 0.0]) is None
+    
+    def test_semantic_cache_rejects_different_identifiers(self):
+        """Test that similar requests naming different entities do not hit."""
+        cache = SemanticCache(threshold=0.9)
+        cache.add("Refactor UserService", [1.0, 0.0, 0.1], ["UserService"])
+        
+        assert cache.lookup("Refactor OrderService", [1.0, 0.0, 0.1]) is None
+    
+    def test_semantic_cache_persists(self, tmp_path):
+        """Test that flushed semantic entries survive a reload."""
+        path = str(tmp_path / "semantic_cache.json")
+        cache = SemanticCache(path)
+        cache.add("Refactor UserService", [1.0, 0.0], ["UserService"])
+        cache.flush()
+        
+        assert SemanticCache(path).lookup("Refactor UserService", [1.0, 0.0]) == ["UserService"]
+    
+    def test_semantic_cache_saves_in_batches(self, tmp_path):
+        """Test that the file is rewritten once per save_every adds, leaving no temp files."""
+        path = tmp_path / "semantic_cache.json"
+        cache = SemanticCache(str(path), save_every=3)
+        
+        with patch("src.processors.response_cache._write_json_atomic", wraps=response_cache._write_json_atomic) as save:
+            for i in range(7):
+                cache.add(f"Refactor Service{i}", [1.0, float(i)], [f"Service{i}"])
+            assert save.call_count == 2
+            
+            cache.flush()
+            cache.flush()
+            assert save.call_count == 3
+        
+        assert len(json.loads(path.read_text())) == 7
+        assert [p.name for p in tmp_path.iterdir()] == ["semantic_cache.json"]
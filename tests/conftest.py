@@ -1,10 +1,11 @@
 """
 Pytest configuration and shared fixtures for the test suite.
 """
+import copy
+import os
 import tempfile
 import shutil
-from typing import Generator
-from unittest.mock import Mock, MagicMock
+from typing import Any, Dict, Generator
 import pytest
 from pathlib import Path
 
@@ -17,17 +18,19 @@ def temp_dir() -> Generator[str, None, None]:
     shutil.rmtree(temp_path)
 
 
-@pytest.fixture
-def test_project_dir(temp_dir: str) -> str:
-    """Create a test project structure."""
+@pytest.fixture(scope="session")
+def _project_template(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Build the test project structure once per session."""
+    template_dir = tmp_path_factory.mktemp("project_template")
+    
     # Create directories
-    src_dir = Path(temp_dir) / "src"
+    src_dir = template_dir / "src"
     src_dir.mkdir()
     
-    tests_dir = Path(temp_dir) / "tests"
+    tests_dir = template_dir / "tests"
     tests_dir.mkdir()
     
-    docs_dir = Path(temp_dir) / "docs"
+    docs_dir = template_dir / "docs"
     docs_dir.mkdir()
     
     # Create test files
@@ -55,7 +58,7 @@ def test_main():
     main()
 """)
     
-    (Path(temp_dir) / "README.md").write_text("""
+    (template_dir / "README.md").write_text("""
 # Test Project
 
 This is a test project for unit testing.
@@ -76,6 +79,14 @@ The main application class.
 - calculate_sum: Adds two numbers
 """)
     
+    return template_dir
+
+
+@pytest.fixture
+def test_project_dir(temp_dir: str, _project_template: Path) -> str:
+    """Create a test project structure."""
+    # Copy rather than hardlink so tests that edit files cannot change the template
+    shutil.copytree(_project_template, temp_dir, dirs_exist_ok=True)
     return temp_dir
 
 
@@ -89,45 +100,65 @@ def mock_graph():
 
 @pytest.fixture
 def mock_neo4j_driver():
-    """Create a mock Neo4j driver."""
-    driver = MagicMock()
-    session = MagicMock()
-    driver.session.return_value.__enter__.return_value = session
-    driver.session.return_value.__exit__.return_value = None
-    return driver
+    """Create an in-memory Neo4j driver that records writes."""
+    from tests.fixtures.fake_neo4j import FakeNeo4jDriver
+    return FakeNeo4jDriver()
+
+
+# Canned extract_concepts reply returned by mock_llm_service
+_CONCEPTS = {
+    "concepts": [
+        {"name": "Test Concept", "description": "A test concept"}
+    ],
+    "entities": [
+        {"name": "TestEntity", "type": "class"}
+    ],
+    "relationships": [],
+    "code_references": []
+}
+
+
+class _FakeLLMService:
+    """LLM service stand-in with canned replies and no Mock call recording."""
+    
+    def generate_description(self, *args: Any, **kwargs: Any) -> str:
+        return "Test description"
+    
+    def extract_concepts(self, *args: Any, **kwargs: Any) -> Dict[str, Any]:
+        # Copied so a test that edits the reply cannot leak into the next
+        return copy.deepcopy(_CONCEPTS)
 
 
 @pytest.fixture
-def mock_llm_service():
+def mock_llm_service() -> _FakeLLMService:
     """Create a mock LLM service."""
-    llm_service = Mock()
-    llm_service.generate_description.return_value = "Test description"
-    llm_service.extract_concepts.return_value = {
-        "concepts": [
-            {"name": "Test Concept", "description": "A test concept"}
-        ],
-        "entities": [
-            {"name": "TestEntity", "type": "class"}
-        ],
-        "relationships": [],
-        "code_references": []
-    }
-    return llm_service
-
-
-@pytest.fixture(autouse=True)
-def setup_test_env(monkeypatch: pytest.MonkeyPatch):
-    """Set up test environment variables."""
-    # Mock Azure OpenAI configuration to prevent errors
-    monkeypatch.setenv("AZURE_OPENAI_KEY", "test-key")
-    monkeypatch.setenv("AZURE_OPENAI_ENDPOINT", "https://test.openai.azure.com")
-    monkeypatch.setenv("AZURE_OPENAI_MODEL_CHAT", "gpt-4")
-    
-    # Set test database configuration
-    monkeypatch.setenv("NEO4J_URI", "bolt://localhost:7687")
-    monkeypatch.setenv("NEO4J_USER", "neo4j")
-    monkeypatch.setenv("NEO4J_PASSWORD", "test-password")
-    monkeypatch.setenv("NEO4J_DATABASE", "test")
+    return _FakeLLMService()
+
+
+# Mock Azure OpenAI configuration to prevent errors, and point at a test database
+TEST_ENV = {
+    "AZURE_OPENAI_KEY": "test-key",
+    "AZURE_OPENAI_ENDPOINT": "https://test.openai.azure.com",
+    "AZURE_OPENAI_MODEL_CHAT": "gpt-4",
+    "NEO4J_URI": "bolt://localhost:7687",
+    "NEO4J_USER": "neo4j",
+    "NEO4J_PASSWORD": "test-password",
+    "NEO4J_DATABASE": "test",
+}
+
+
+@pytest.fixture(scope="session", autouse=True)
+def setup_test_env() -> Generator[None, None, None]:
+    """Set up test environment variables once for the whole session."""
+    # Tests that change these should still use monkeypatch, which restores the session values
+    old = {key: os.environ.get(key) for key in TEST_ENV}
+    os.environ.update(TEST_ENV)
+    yield
+    for key, value in old.items():
+        if value is None:
+            os.environ.pop(key, None)
+        else:
+            os.environ[key] = value
 
 
 @pytest.fixture
@@ -166,4 +197,4 @@ def sample_function_node():
         level=2,
         start_line=25,
         end_line=30
-    )
\ No newline at end of file
+    )
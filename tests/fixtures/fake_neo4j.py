@@ -0,0 +1,86 @@
+"""
+In-process stand-in for the Neo4j driver used by Neo4jManager.
+"""
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+class FakeNeo4jResult(list):
+    """Query result that records whether it was consumed."""
+    
+    consumed = False
+    
+    def consume(self) -> None:
+        self.consumed = True
+
+
+class FakeNeo4jSession:
+    """Session that records queries and applies Neo4jManager writes to its driver's store."""
+    
+    def __init__(self, driver: "FakeNeo4jDriver"):
+        self._driver = driver
+        self.closed = False
+    
+    def run(self, query: str, parameters: Optional[Dict[str, Any]] = None, **kwargs: Any) -> FakeNeo4jResult:
+        """Record the query and apply node, edge and path-delete parameters."""
+        params = {**(parameters or {}), **kwargs}
+        self._driver.queries.append((query, params))
+        self._driver.apply(params)
+        result = FakeNeo4jResult()
+        self._driver.results.append(result)
+        return result
+    
+    def execute_write(self, transaction_function: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run a transaction function with this session standing in for the transaction."""
+        return transaction_function(self, *args, **kwargs)
+    
+    execute_read = execute_write
+    
+    def close(self) -> None:
+        self.closed = True
+    
+    def __enter__(self) -> "FakeNeo4jSession":
+        return self
+    
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+class FakeNeo4jDriver:
+    """Driver whose graph lives in dicts, so tests can assert on what was written."""
+    
+    def __init__(self):
+        self.nodes: Dict[str, Dict[str, Any]] = {}
+        self.relationships: List[Tuple[str, str, str]] = []
+        self.queries: List[Tuple[str, Dict[str, Any]]] = []
+        self.sessions: List[FakeNeo4jSession] = []
+        self.results: List[FakeNeo4jResult] = []
+        self.closed = False
+    
+    def session(self, **kwargs: Any) -> FakeNeo4jSession:
+        session = FakeNeo4jSession(self)
+        self.sessions.append(session)
+        return session
+    
+    def verify_connectivity(self) -> None:
+        pass
+    
+    def close(self) -> None:
+        self.closed = True
+    
+    def apply(self, params: Dict[str, Any]) -> None:
+        """Apply the parameters Neo4jManager sends for node, edge and delete queries."""
+        for node in params.get("nodeList", []):
+            attributes = node["attributes"]
+            self.nodes[attributes["node_id"]] = {**attributes, "labels": node["extra_labels"] + [node["type"], "NODE"]}
+        
+        for edge in params.get("edgesList", []):
+            if edge["sourceId"] in self.nodes and edge["targetId"] in self.nodes:
+                self.relationships.append((edge["sourceId"], edge["type"], edge["targetId"]))
+        
+        paths = params.get("paths", [params["path"]] if "path" in params else [])
+        if paths:
+            deleted = {node_id for node_id, node in self.nodes.items() if node.get("path") in paths}
+            self.nodes = {node_id: node for node_id, node in self.nodes.items() if node_id not in deleted}
+            self.relationships = [
+                rel for rel in self.relationships if rel[0] not in deleted and rel[2] not in deleted
+            ]
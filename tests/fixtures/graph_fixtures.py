@@ -1,17 +1,33 @@
 """
 Graph fixtures for testing graph operations.
 """
+from typing import Optional
+
 from cue.graph.graph import Graph
-# Removed unused imports - FileNode, ClassNode, FunctionNode
-from cue.graph.node.filesystem_file_node import FilesystemFileNode
-from cue.graph.node.filesystem_directory_node import FilesystemDirectoryNode
 from cue.graph.relationship.relationship import Relationship
 from cue.graph.relationship.relationship_type import RelationshipType
 
 
-def create_test_graph():
-    """Create a test graph with sample nodes and relationships."""
-    graph = Graph()
+def _build_graph(nodes, relationships, graph: Optional[Graph] = None):
+    """Add flat node and relationship lists to graph (a new one if None) in two bulk calls."""
+    if graph is None:
+        graph = Graph()
+    graph.add_nodes(nodes)
+    graph.add_references_relationships(relationships)
+    return graph
+
+
+def create_test_graph(graph: Optional[Graph] = None):
+    """Create a test graph with sample nodes and relationships, or add them to graph when one is given."""
+    return _build_graph(*_test_graph_elements(), graph)
+
+
+def _test_graph_elements():
+    """Build the nodes and relationships of the sample graph."""
+    # Node classes are imported only when a fixture graph is requested
+    from cue.graph.node.filesystem_file_node import FilesystemFileNode
+    from cue.graph.node.concept_node import ConceptNode
+    from cue.graph.node.documented_entity_node import DocumentedEntityNode
     
     # Add filesystem file nodes instead of code nodes
     main_file = FilesystemFileNode(
@@ -42,20 +58,12 @@ def create_test_graph():
         last_modified=1234567890.0
     )
     
-    graph.add_node(main_file)
-    graph.add_node(utils_file)
-    graph.add_node(test_file)
-    
     # Add documentation nodes
-    from cue.graph.node.concept_node import ConceptNode
-    from cue.graph.node.documented_entity_node import DocumentedEntityNode
-    
     app_concept = ConceptNode(
         name="Application Architecture",
         description="Main application structure and design",
         source_file="src/main.py"
     )
-    graph.add_node(app_concept)
     
     # Add documented entities
     main_entity = DocumentedEntityNode(
@@ -71,11 +79,8 @@ def create_test_graph():
         source_file="src/utils.py"
     )
     
-    graph.add_node(main_entity)
-    graph.add_node(format_entity)
-    
-    # Add relationships
-    graph.add_references_relationships([
+    nodes = [main_file, utils_file, test_file, app_concept, main_entity, format_entity]
+    relationships = [
         Relationship(
             start_node=main_file,
             end_node=app_concept,
@@ -96,14 +101,20 @@ def create_test_graph():
             end_node=main_file,
             rel_type=RelationshipType.DEPENDS_ON
         )
-    ])
+    ]
     
-    return graph
+    return nodes, relationships
 
 
-def create_filesystem_graph():
-    """Create a test graph with filesystem nodes."""
-    graph = Graph()
+def create_filesystem_graph(graph: Optional[Graph] = None):
+    """Create a test graph with filesystem nodes, or add them to graph when one is given."""
+    return _build_graph(*_filesystem_graph_elements(), graph)
+
+
+def _filesystem_graph_elements():
+    """Build the nodes and relationships of the filesystem graph."""
+    from cue.graph.node.filesystem_file_node import FilesystemFileNode
+    from cue.graph.node.filesystem_directory_node import FilesystemDirectoryNode
     
     # Add filesystem directory nodes
     root_dir = FilesystemDirectoryNode(
@@ -125,10 +136,6 @@ def create_filesystem_graph():
         relative_path="tests"
     )
     
-    graph.add_node(root_dir)
-    graph.add_node(src_dir)
-    graph.add_node(tests_dir)
-    
     # Add filesystem file nodes
     main_fs_file = FilesystemFileNode(
         path="file:///test/src/main.py",
@@ -149,11 +156,8 @@ def create_filesystem_graph():
         last_modified=1234567890
     )
     
-    graph.add_node(main_fs_file)
-    graph.add_node(utils_fs_file)
-    
-    # Add filesystem relationships
-    graph.add_references_relationships([
+    nodes = [root_dir, src_dir, tests_dir, main_fs_file, utils_fs_file]
+    relationships = [
         Relationship(
             start_node=root_dir,
             end_node=src_dir,
@@ -174,19 +178,22 @@ def create_filesystem_graph():
             end_node=utils_fs_file,
             rel_type=RelationshipType.FILESYSTEM_CONTAINS
         )
-    ])
+    ]
     
-    return graph
+    return nodes, relationships
 
 
-def create_documentation_graph():
-    """Create a test graph with documentation nodes."""
+def create_documentation_graph(graph: Optional[Graph] = None):
+    """Create a test graph with documentation nodes, or add them to graph when one is given."""
+    return _build_graph(*_documentation_graph_elements(), graph)
+
+
+def _documentation_graph_elements():
+    """Build the nodes and relationships of the documentation graph."""
     from cue.graph.node.documentation_file_node import DocumentationFileNode
     from cue.graph.node.concept_node import ConceptNode
     from cue.graph.node.documented_entity_node import DocumentedEntityNode
     
-    graph = Graph()
-    
     # Add documentation file node
     readme = DocumentationFileNode(
         path="file:///test/README.md",
@@ -195,7 +202,6 @@ def create_documentation_graph():
         relative_path="README.md",
         doc_type="markdown"
     )
-    graph.add_node(readme)
     
     # Add concept nodes
     architecture_concept = ConceptNode(
@@ -209,9 +215,6 @@ def create_documentation_graph():
         source_file="docs/patterns.md"
     )
     
-    graph.add_node(architecture_concept)
-    graph.add_node(pattern_concept)
-    
     # Add documented entity
     user_service = DocumentedEntityNode(
         name="UserService",
@@ -219,10 +222,9 @@ def create_documentation_graph():
         description="Handles user management operations",
         source_file="README.md"
     )
-    graph.add_node(user_service)
     
-    # Add relationships
-    graph.add_references_relationships([
+    nodes = [readme, architecture_concept, pattern_concept, user_service]
+    relationships = [
         Relationship(
             start_node=readme,
             end_node=architecture_concept,
@@ -233,34 +235,20 @@ def create_documentation_graph():
             end_node=user_service,
             rel_type=RelationshipType.DESCRIBES_ENTITY
         )
-    ])
+    ]
     
-    return graph
+    return nodes, relationships
 
 
 def create_complex_graph():
     """Create a complex test graph with all node types and relationships."""
-    # Start with basic code graph
-    graph = create_test_graph()
-    
-    # Add filesystem nodes
-    fs_graph = create_filesystem_graph()
-    for node in fs_graph.get_all_nodes():
-        graph.add_node(node)
-    
-    # Add documentation nodes
-    doc_graph = create_documentation_graph()
-    for node in doc_graph.get_all_nodes():
-        graph.add_node(node)
-    
-    # Add all relationships
-    for rel in fs_graph.get_all_relationships():
-        graph.add_references_relationships([rel])
-    for rel in doc_graph.get_all_relationships():
-        graph.add_references_relationships([rel])
+    # Each builder adds straight into the one graph, so nothing is copied between graphs
+    graph = Graph()
+    create_test_graph(graph)
+    create_filesystem_graph(graph)
+    create_documentation_graph(graph)
     
-    # Connect filesystem to code nodes
-    # This would normally be done by the graph builder
-    # but we'll simulate it here for testing
+    # Connecting filesystem to code nodes would normally be done by the graph
+    # builder; the fixture leaves them unlinked
     
-    return graph
\ No newline at end of file
+    return graph
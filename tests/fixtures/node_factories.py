@@ -1,23 +1,81 @@
-from typing import Optional, List, Any
 """
 Factory functions for creating test nodes.
+
+Node classes are imported inside each factory so that importing this module
+does not load the cue.graph node tree during test collection.
 """
-import time
-from cue.graph.node.file_node import FileNode
-from cue.graph.node.folder_node import FolderNode
-from cue.graph.node.class_node import ClassNode
-from cue.graph.node.function_node import FunctionNode
-from cue.graph.node.filesystem_file_node import FilesystemFileNode
-from cue.graph.node.filesystem_directory_node import FilesystemDirectoryNode
-from cue.graph.node.documentation_file_node import DocumentationFileNode
-from cue.graph.node.concept_node import ConceptNode
-from cue.graph.node.documented_entity_node import DocumentedEntityNode
-from cue.graph.node.description_node import DescriptionNode
-from cue.graph.graph_environment import GraphEnvironment
+import functools
+import sys
+from types import SimpleNamespace
+from typing import Optional, Any, Iterable, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from cue.graph.graph_environment import GraphEnvironment
+
+
+# Tree-sitter scaffolding shared by every factory-made definition node; only the
+# node range and the tree-sitter node's text differ between calls
+_DEFINITION_RANGE = SimpleNamespace(
+    range=SimpleNamespace(start=SimpleNamespace(line=0, character=0), end=SimpleNamespace(line=0, character=0)),
+    start_dict={"line": 0, "character": 0}
+)
+_BODY_NODE = SimpleNamespace(start_byte=0, end_byte=0, named_children=())
+
+# Source text given to every factory-made file node
+_FILE_CODE_TEXT = "# File content"
+_FILE_CODE_BYTES = _FILE_CODE_TEXT.encode()
+
+# Fixed modification time so filesystem fixtures are deterministic
+_DEFAULT_MTIME = 1_700_000_000.0
+
+# URI prefix of the fake project root every factory-made node lives under
+_TEST_URI_PREFIX = "file:///test/"
+
+
+def _test_uri(relative_path: str) -> str:
+    """Return the interned URI of a path under the fake project root."""
+    return sys.intern(_TEST_URI_PREFIX + relative_path)
+
+
+def _intern_path(path: Optional[str]) -> Optional[str]:
+    """Intern an optional path, passing None through."""
+    return None if path is None else sys.intern(path)
+
+
+def _make_node_range(start_line: int, end_line: int) -> SimpleNamespace:
+    """Build a node range exposing range.start.line and range.end.line."""
+    return SimpleNamespace(range=SimpleNamespace(start=SimpleNamespace(line=start_line), end=SimpleNamespace(line=end_line)))
+
 
+@functools.lru_cache(maxsize=256)
+def _class_text(name: str) -> Tuple[str, bytes]:
+    """Return the source text of a stub class and its encoded bytes."""
+    code_text = f"class {name}: pass"
+    return code_text, code_text.encode()
 
+
+@functools.lru_cache(maxsize=256)
+def _function_text(name: str) -> Tuple[str, bytes]:
+    """Return the source text of a stub function and its encoded bytes."""
+    code_text = f"def {name}(): pass"
+    return code_text, code_text.encode()
+
+
+def _no_child(field_name: str) -> None:
+    """Stand in for TreeSitterNode.child_by_field_name on a node without children."""
+    return None
+
+
+def _make_tree_sitter_node(text: bytes) -> SimpleNamespace:
+    """Build a tree-sitter node stand-in for the given source text."""
+    return SimpleNamespace(text=text, start_byte=0, child_by_field_name=_no_child)
+
+
+@functools.lru_cache(maxsize=1)
 def get_test_graph_environment():
-    """Get a default graph environment for testing."""
+    """Get the shared default graph environment for testing (use cache_clear() to reset)."""
+    from cue.graph.graph_environment import GraphEnvironment
+    
     return GraphEnvironment(
         environment="test",
         diff_identifier="test_diff",
@@ -25,163 +83,176 @@ def get_test_graph_environment():
     )
 
 
-def create_file_node(name: str = "test.py", path: Optional[str] = None, level: int = 1):
+def create_file_node(name: str = "test.py", path: Optional[str] = None, level: int = 1,
+                     graph_environment: Optional["GraphEnvironment"] = None):
     """Create a file node with default values."""
-    from unittest.mock import Mock
-    
-    if path is None:
-        path = f"file:///test/{name}"
+    from cue.graph.node.file_node import FileNode
     
-    # Create mock tree-sitter objects
-    mock_definition_range = Mock()
-    mock_node_range = Mock()
-    mock_node_range.range = Mock()
-    mock_node_range.range.start = Mock(line=1)
-    mock_node_range.range.end = Mock(line=100)
-    mock_body_node = Mock()
-    mock_tree_sitter_node = Mock()
-    mock_tree_sitter_node.text = b"# File content"
-    mock_tree_sitter_node.start_byte = 0
+    name = sys.intern(name)
+    path = _test_uri(name) if path is None else sys.intern(path)
     
     return FileNode(
-        definition_range=mock_definition_range,
-        node_range=mock_node_range,
-        code_text="# File content",
-        body_node=mock_body_node,
-        tree_sitter_node=mock_tree_sitter_node,
+        definition_range=_DEFINITION_RANGE,
+        node_range=_make_node_range(1, 100),
+        code_text=_FILE_CODE_TEXT,
+        body_node=_BODY_NODE,
+        tree_sitter_node=_make_tree_sitter_node(_FILE_CODE_BYTES),
         path=path,
         name=name,
         level=level,
-        graph_environment=get_test_graph_environment()
+        graph_environment=graph_environment or get_test_graph_environment()
     )
 
 
 def create_folder_node(name: str = "src", path: Optional[str] = None, level: int = 0):
     """Create a folder node with default values."""
-    if path is None:
-        path = f"file:///test/{name}"
+    from cue.graph.node.folder_node import FolderNode
+    
+    name = sys.intern(name)
+    path = _test_uri(name) if path is None else sys.intern(path)
     return FolderNode(path=path, name=name, level=level)
 
 
 def create_class_node(name: str = "TestClass", path: Optional[str] = "file:///test/main.py", 
-                     start_line: int = 10, end_line: int = 50):
+                     start_line: int = 10, end_line: int = 50,
+                     graph_environment: Optional["GraphEnvironment"] = None):
     """Create a class node with default values."""
-    from unittest.mock import Mock
-    
-    # Create mock tree-sitter objects
-    mock_definition_range = Mock()
-    mock_node_range = Mock()
-    mock_node_range.range = Mock()
-    mock_node_range.range.start = Mock(line=start_line)
-    mock_node_range.range.end = Mock(line=end_line)
-    mock_body_node = Mock()
-    mock_tree_sitter_node = Mock()
-    mock_tree_sitter_node.text = f"class {name}: pass".encode()
-    mock_tree_sitter_node.start_byte = 0
+    from cue.graph.node.class_node import ClassNode
     
+    name = sys.intern(name)
+    path = _intern_path(path)
+    code_text, text_bytes = _class_text(name)
     return ClassNode(
-        definition_range=mock_definition_range,
-        node_range=mock_node_range,
-        code_text=f"class {name}: pass",
-        body_node=mock_body_node,
-        tree_sitter_node=mock_tree_sitter_node,
+        definition_range=_DEFINITION_RANGE,
+        node_range=_make_node_range(start_line, end_line),
+        code_text=code_text,
+        body_node=_BODY_NODE,
+        tree_sitter_node=_make_tree_sitter_node(text_bytes),
         name=name,
         path=path,
         level=2,
-        graph_environment=get_test_graph_environment()
+        graph_environment=graph_environment or get_test_graph_environment()
     )
 
 
 def create_function_node(name: str = "test_function", path: Optional[str] = "file:///test/main.py",
-                        start_line: int = 5, end_line: int = 8):
+                        start_line: int = 5, end_line: int = 8,
+                        graph_environment: Optional["GraphEnvironment"] = None):
     """Create a function node with default values."""
-    from unittest.mock import Mock
-    
-    # Create mock tree-sitter objects
-    mock_definition_range = Mock()
-    mock_node_range = Mock()
-    mock_node_range.range = Mock()
-    mock_node_range.range.start = Mock(line=start_line)
-    mock_node_range.range.end = Mock(line=end_line)
-    mock_body_node = Mock()
-    mock_tree_sitter_node = Mock()
-    mock_tree_sitter_node.text = f"def {name}(): pass".encode()
-    mock_tree_sitter_node.start_byte = 0
+    return create_function_nodes([(name, path, start_line, end_line)], graph_environment)[0]
+
+
+def create_function_nodes(specs: Iterable[Tuple[str, Optional[str], int, int]],
+                          graph_environment: Optional["GraphEnvironment"] = None) -> list:
+    """Create function nodes in bulk from (name, path, start_line, end_line) specs."""
+    from cue.graph.node.function_node import FunctionNode
     
-    return FunctionNode(
-        definition_range=mock_definition_range,
-        node_range=mock_node_range,
-        code_text=f"def {name}(): pass",
-        body_node=mock_body_node,
-        tree_sitter_node=mock_tree_sitter_node,
-        name=name,
-        path=path,
-        level=2,
-        graph_environment=get_test_graph_environment()
-    )
+    graph_environment = graph_environment or get_test_graph_environment()
+    nodes = []
+    for name, path, start_line, end_line in specs:
+        name = sys.intern(name)
+        path = _intern_path(path)
+        code_text, text_bytes = _function_text(name)
+        nodes.append(FunctionNode(
+            definition_range=_DEFINITION_RANGE,
+            node_range=_make_node_range(start_line, end_line),
+            code_text=code_text,
+            body_node=_BODY_NODE,
+            tree_sitter_node=_make_tree_sitter_node(text_bytes),
+            name=name,
+            path=path,
+            level=2,
+            graph_environment=graph_environment
+        ))
+    return nodes
 
 
 def create_filesystem_file_node(name: str = "test.py", relative_path: Optional[str] = None,
-                               size: int = 1024, extension: str = ".py"):
-    """Create a filesystem file node with default values."""
-    if relative_path is None:
-        relative_path = f"src/{name}"
+                               size: int = 1024, extension: str = ".py", level: Optional[int] = None,
+                               last_modified: float = _DEFAULT_MTIME,
+                               graph_environment: Optional["GraphEnvironment"] = None):
+    """Create a filesystem file node with default values (level derived from relative_path if None)."""
+    from cue.graph.node.filesystem_file_node import FilesystemFileNode
+    
+    name = sys.intern(name)
+    relative_path = sys.intern(f"src/{name}" if relative_path is None else relative_path)
+    if level is None:
+        level = relative_path.count('/') + 1
     return FilesystemFileNode(
-        path=f"file:///test/{relative_path}",
+        path=_test_uri(relative_path),
         name=name,
-        level=relative_path.count('/') + 1,
+        level=level,
         relative_path=relative_path,
         size=size,
         extension=extension,
-        last_modified=time.time(),
-        graph_environment=get_test_graph_environment()
+        last_modified=last_modified,
+        graph_environment=graph_environment or get_test_graph_environment()
     )
 
 
-def create_filesystem_directory_node(name: str = "src", relative_path: Optional[str] = None):
-    """Create a filesystem directory node with default values."""
-    if relative_path is None:
-        relative_path = name
+def create_filesystem_directory_node(name: str = "src", relative_path: Optional[str] = None,
+                                    level: Optional[int] = None,
+                                    graph_environment: Optional["GraphEnvironment"] = None):
+    """Create a filesystem directory node with default values (level derived from relative_path if None)."""
+    from cue.graph.node.filesystem_directory_node import FilesystemDirectoryNode
+    
+    name = sys.intern(name)
+    relative_path = sys.intern(name if relative_path is None else relative_path)
+    if level is None:
+        level = relative_path.count('/')
     return FilesystemDirectoryNode(
-        path=f"file:///test/{relative_path}",
+        path=_test_uri(relative_path),
         name=name,
-        level=relative_path.count('/'),
+        level=level,
         relative_path=relative_path,
-        graph_environment=get_test_graph_environment()
+        graph_environment=graph_environment or get_test_graph_environment()
     )
 
 
 def create_documentation_file_node(name: str = "README.md", relative_path: Optional[str] = None,
-                                  doc_type: str = "markdown"):
-    """Create a documentation file node with default values."""
-    if relative_path is None:
-        relative_path = name
+                                  doc_type: str = "markdown", level: Optional[int] = None,
+                                  graph_environment: Optional["GraphEnvironment"] = None):
+    """Create a documentation file node with default values (level derived from relative_path if None)."""
+    from cue.graph.node.documentation_file_node import DocumentationFileNode
+    
+    name = sys.intern(name)
+    relative_path = sys.intern(name if relative_path is None else relative_path)
+    if level is None:
+        level = relative_path.count('/')
     return DocumentationFileNode(
-        path=f"file:///test/{relative_path}",
+        path=_test_uri(relative_path),
         name=name,
-        level=relative_path.count('/'),
+        level=level,
         relative_path=relative_path,
         doc_type=doc_type,
-        graph_environment=get_test_graph_environment()
+        graph_environment=graph_environment or get_test_graph_environment()
     )
 
 
 def create_concept_node(name: str = "Design Pattern", description: Optional[str] = None,
-                       source_file: str = "README.md"):
+                       source_file: str = "README.md",
+                       graph_environment: Optional["GraphEnvironment"] = None):
     """Create a concept node with default values."""
+    from cue.graph.node.concept_node import ConceptNode
+    
+    name = sys.intern(name)
     if description is None:
         description = f"Description of {name}"
     return ConceptNode(
         name=name,
         description=description,
         source_file=source_file,
-        graph_environment=get_test_graph_environment()
+        graph_environment=graph_environment or get_test_graph_environment()
     )
 
 
 def create_documented_entity_node(name: str = "UserService", entity_type: str = "class",
-                                 description: Optional[str] = None, source_file: str = "README.md"):
+                                 description: Optional[str] = None, source_file: str = "README.md",
+                                 graph_environment: Optional["GraphEnvironment"] = None):
     """Create a documented entity node with default values."""
+    from cue.graph.node.documented_entity_node import DocumentedEntityNode
+    
+    name = sys.intern(name)
     if description is None:
         description = f"Description of {name}"
     return DocumentedEntityNode(
@@ -189,71 +260,53 @@ def create_documented_entity_node(name: str = "UserService", entity_type: str =
         entity_type=entity_type,
         description=description,
         source_file=source_file,
-        graph_environment=get_test_graph_environment()
+        graph_environment=graph_environment or get_test_graph_environment()
     )
 
 
 def create_description_node(target_node_id: str, description: str = "Test description",
-                           model: str = "gpt-4", path: Optional[str] = None):
+                           model: str = "gpt-4", path: Optional[str] = None,
+                           graph_environment: Optional["GraphEnvironment"] = None):
     """Create a description node with default values."""
-    if path is None:
-        path = f"file:///test/description_{target_node_id}"
+    from cue.graph.node.description_node import DescriptionNode
+    
+    path = _test_uri(f"description_{target_node_id}") if path is None else sys.intern(path)
     return DescriptionNode(
         path=path,
-        name=f"description_for_{target_node_id}",
+        name=sys.intern(f"description_for_{target_node_id}"),
         level=1,
         description_text=description,
         target_node_id=target_node_id,
         llm_model=model,
-        graph_environment=get_test_graph_environment()
+        graph_environment=graph_environment or get_test_graph_environment()
     )
 
 
-def create_sample_project_nodes() -> List[Any]:
+# (kind, positional args) for each node of the sample project, in output order
+_SAMPLE_PROJECT_SPECS: Tuple[Tuple[str, Tuple[Any, ...]], ...] = (
+    ("folder", ("project", "file:///test/project", 0)),
+    ("folder", ("src", "file:///test/project/src", 1)),
+    ("file", ("main.py", "file:///test/project/src/main.py", 2)),
+    ("class", ("Application", "file:///test/project/src/main.py", 10, 50)),
+    ("class", ("Config", "file:///test/project/src/main.py", 52, 70)),
+    ("function", ("main", "file:///test/project/src/main.py", 72, 80)),
+    ("function", ("initialize", "file:///test/project/src/main.py", 82, 90)),
+    ("file", ("utils.py", "file:///test/project/src/utils.py", 2)),
+    ("function", ("format_string", "file:///test/project/src/utils.py", 1, 5)),
+    ("function", ("validate_input", "file:///test/project/src/utils.py", 7, 15)),
+    ("folder", ("tests", "file:///test/project/tests", 1)),
+    ("file", ("test_main.py", "file:///test/project/tests/test_main.py", 2)),
+    ("documentation", ("README.md", "README.md", "markdown", 0)),
+)
+
+
+def create_sample_project_nodes() -> list:
     """Create a set of nodes representing a sample project structure."""
-    nodes: List[Any] = []
-    
-    # Root folder
-    root = create_folder_node("project", "file:///test/project", 0)
-    nodes.append(root)
-    
-    # Source folder
-    src = create_folder_node("src", "file:///test/project/src", 1)
-    nodes.append(src)
-    
-    # Main file
-    main_file = create_file_node("main.py", "file:///test/project/src/main.py", 2)
-    nodes.append(main_file)
-    
-    # Classes in main file
-    app_class = create_class_node("Application", main_file.path, 10, 50)
-    config_class = create_class_node("Config", main_file.path, 52, 70)
-    nodes.extend([app_class, config_class])
-    
-    # Functions in main file
-    main_func = create_function_node("main", main_file.path, 72, 80)
-    init_func = create_function_node("initialize", main_file.path, 82, 90)
-    nodes.extend([main_func, init_func])
-    
-    # Utils file
-    utils_file = create_file_node("utils.py", "file:///test/project/src/utils.py", 2)
-    nodes.append(utils_file)
-    
-    # Functions in utils file
-    format_func = create_function_node("format_string", utils_file.path, 1, 5)
-    validate_func = create_function_node("validate_input", utils_file.path, 7, 15)
-    nodes.extend([format_func, validate_func])
-    
-    # Test folder
-    tests = create_folder_node("tests", "file:///test/project/tests", 1)
-    nodes.append(tests)
-    
-    # Test file
-    test_file = create_file_node("test_main.py", "file:///test/project/tests/test_main.py", 2)
-    nodes.append(test_file)
-    
-    # Documentation
-    readme = create_documentation_file_node("README.md", "README.md")
-    nodes.append(readme)
-    
-    return nodes
\ No newline at end of file
+    factories = {
+        "folder": create_folder_node,
+        "file": create_file_node,
+        "class": create_class_node,
+        "function": create_function_node,
+        "documentation": create_documentation_file_node,
+    }
+    return [factories[kind](*args) for kind, args in _SAMPLE_PROJECT_SPECS]
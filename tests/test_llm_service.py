@@ -2,6 +2,7 @@ from typing import Any
 import unittest
 from unittest.mock import patch, MagicMock, call
 import os
+import threading
 from cue.llm_descriptions.llm_service import LLMService, retry_on_exception
 
 
@@ -337,7 +338,8 @@ class TestLLMService(unittest.TestCase):
             {"id": "another_immediate", "prompt": "Prompt 5"}
         ]
         
-        with patch('cue.llm_descriptions.llm_service.time.sleep'):
+        # The scripted side effects assume prompts are sent one at a time
+        with patch('cue.llm_descriptions.llm_service.time.sleep'), patch.dict(os.environ, {'LLM_MAX_WORKERS': '1'}):
             results = service.generate_batch_descriptions(prompts, batch_size=2)
         
         # Verify results match expected patterns
@@ -350,12 +352,33 @@ class TestLLMService(unittest.TestCase):
         # Total calls: 1 + 3 + 3 + 2 + 1 = 10
         self.assertEqual(mock_client.chat.completions.create.call_count, 10)
     
+    @patch('cue.llm_descriptions.llm_service.AzureOpenAI')
+    def test_generate_batch_descriptions_runs_concurrently(self, mock_azure_openai: Any):
+        """Test prompts in a batch are described in parallel, up to LLM_MAX_WORKERS."""
+        barrier = threading.Barrier(3, timeout=5)
+        
+        def fake_create(**kwargs: Any) -> Any:
+            barrier.wait()
+            response = MagicMock()
+            response.choices[0].message.content = f"Description of {kwargs['messages'][1]['content']}"
+            return response
+        
+        mock_azure_openai.return_value.chat.completions.create.side_effect = fake_create
+        service = LLMService()
+        prompts = [{"id": f"node{i}", "prompt": f"Prompt {i}"} for i in range(6)]
+        
+        with patch.dict(os.environ, {'LLM_MAX_WORKERS': '3'}):
+            results = service.generate_batch_descriptions(prompts, batch_size=6)
+        
+        self.assertEqual(list(results), [f"node{i}" for i in range(6)])
+        self.assertEqual(results["node4"], "Description of Prompt 4")
+    
     def test_is_enabled(self):
         """Test is_enabled method."""
         with patch('cue.llm_descriptions.llm_service.AzureOpenAI'):
             service = LLMService()
             self.assertTrue(service.is_enabled())
-            
+        
         with patch.dict(os.environ, {'ENABLE_LLM_DESCRIPTIONS': 'false'}):
             service = LLMService()
             self.assertFalse(service.is_enabled())
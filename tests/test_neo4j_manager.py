@@ -0,0 +1,82 @@
+"""
+Tests for batched writes in the Neo4j database manager.
+"""
+import unittest
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+pytest.importorskip("neo4j")
+
+from cue.db_managers.db_manager import AbstractDbManager
+from cue.db_managers.neo4j_manager import Neo4jManager
+from tests.fixtures.fake_neo4j import FakeNeo4jDriver
+
+
+def _node(node_id: str, path: str):
+    """Build a node object in the shape produced by Graph.get_nodes_as_objects."""
+    return {"type": "FILE", "extra_labels": [], "attributes": {"node_id": node_id, "path": path}}
+
+
+class TestNeo4jManagerBatching(unittest.TestCase):
+    """Test that writes go to Neo4j in bulk."""
+    
+    def setUp(self):
+        """Set up a manager backed by the in-memory driver."""
+        self.driver = FakeNeo4jDriver()
+        with patch("cue.db_managers.neo4j_manager.GraphDatabase") as graph_database:
+            graph_database.driver.return_value = self.driver
+            self.manager = Neo4jManager(repo_id="repo", entity_id="entity")
+    
+    def test_save_graph_uses_large_batches(self):
+        """Test nodes and edges are each written in one query with the batch size."""
+        nodes = [_node(str(i), f"file:///src/{i}.py") for i in range(3)]
+        edges = [{"sourceId": "0", "targetId": "1", "type": "CONTAINS", "scopeText": ""}]
+        
+        self.manager.save_graph(nodes, edges)
+        
+        self.assertEqual(len(self.driver.queries), 2)
+        self.assertEqual([params["batchSize"] for _, params in self.driver.queries], [Neo4jManager.BATCH_SIZE] * 2)
+        self.assertEqual(sorted(self.driver.nodes), ["0", "1", "2"])
+        self.assertEqual(self.driver.relationships, [("0", "CONTAINS", "1")])
+    
+    def test_delete_paths_in_one_query(self):
+        """Test deleting several paths issues a single UNWIND query."""
+        self.manager.save_graph([_node(str(i), f"file:///src/{i}.py") for i in range(3)], [])
+        
+        self.manager.detatch_delete_nodes_with_paths(["file:///src/0.py", "file:///src/1.py"])
+        
+        query, _ = self.driver.queries[-1]
+        self.assertIn("UNWIND $paths AS path", query)
+        self.assertEqual(list(self.driver.nodes), ["2"])
+        self.assertTrue(self.driver.results[-1].consumed)
+    
+    def test_delete_path_consumes_result(self):
+        """Test a single-path delete is flushed before the call returns."""
+        self.manager.detatch_delete_nodes_with_path("a.py")
+        
+        self.assertTrue(self.driver.results[-1].consumed)
+    
+    def test_session_is_reused_until_close(self):
+        """Test all writes share one session, which close() releases."""
+        self.manager.save_graph([], [])
+        self.manager.detatch_delete_nodes_with_paths(["a.py"])
+        
+        self.assertEqual(len(self.driver.sessions), 1)
+        
+        self.manager.close()
+        
+        self.assertTrue(self.driver.sessions[0].closed)
+        self.assertTrue(self.driver.closed)
+    
+    def test_abstract_default_deletes_each_path(self):
+        """Test managers without a bulk delete fall back to one call per path."""
+        manager = MagicMock()
+        
+        AbstractDbManager.detatch_delete_nodes_with_paths(manager, ["a.py", "b.py"])
+        
+        self.assertEqual(manager.detatch_delete_nodes_with_path.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()